@@ -0,0 +1,227 @@
+import os
+import logging
+import asyncio
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Union
+from pydantic import PrivateAttr
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.language_models.llms import LLM as BaseLLM
+from langchain_core.outputs import GenerationChunk
+from langchain_ollama import OllamaLLM
+
+logger = logging.getLogger(__name__)
+
+# "ollama" talks to the Ollama server over HTTP; "llama_cpp" runs the model in-process
+HIREFLOW_LLM_BACKEND = os.getenv("HIREFLOW_LLM_BACKEND", "ollama")
+
+# GGUF file loaded by the llama_cpp backend
+HIREFLOW_LLAMA_MODEL_PATH = os.getenv("HIREFLOW_LLAMA_MODEL_PATH", "models/llama-3.2-1b-instruct-q4_k_m.gguf")
+
+# Ollama model built from the Modelfile in the project root
+OLLAMA_MODEL = os.getenv("HIREFLOW_OLLAMA_MODEL", "hireflow-llama")
+
+# Context window and output budget; a long CV plus the prompt fits in 4096 tokens
+OLLAMA_NUM_CTX = int(os.getenv("OLLAMA_NUM_CTX", 4096))
+OLLAMA_NUM_PREDICT = int(os.getenv("OLLAMA_NUM_PREDICT", 1024))
+
+# How long Ollama keeps the model loaded after the last request (its own default is 5 minutes)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+
+# CPU threads used by Ollama for inference
+OLLAMA_NUM_THREAD = int(os.getenv("OLLAMA_NUM_THREAD", os.cpu_count()))
+
+class LlamaCppLLM(BaseLLM):
+    """
+    LangChain LLM running a GGUF model in-process with llama-cpp-python.
+
+    Tokens come back through FFI instead of HTTP, and the KV state of
+    previously seen prompt prefixes (the agents' shared preambles) is
+    kept in a RAM cache so it is not recomputed on every call.
+    """
+
+    model_path: str
+    n_ctx: int = OLLAMA_NUM_CTX
+    max_tokens: int = OLLAMA_NUM_PREDICT
+    n_threads: Optional[int] = None
+    n_gpu_layers: int = -1
+
+    _llama: Any = PrivateAttr(default=None)
+    _json_grammar: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        # Optional dependency, only needed for this backend
+        from llama_cpp import Llama, LlamaGrammar, LlamaRAMCache
+        from llama_cpp.llama_grammar import JSON_GBNF
+
+        self._llama = Llama(
+            model_path=self.model_path,
+            n_ctx=self.n_ctx,
+            n_threads=self.n_threads,
+            n_gpu_layers=self.n_gpu_layers,
+            logits_all=False,
+            verbose=False
+        )
+        self._llama.set_cache(LlamaRAMCache())
+        
+        # Same role as Ollama's format="json": sampling is restricted to valid JSON
+        self._json_grammar = LlamaGrammar.from_string(JSON_GBNF, verbose=False)
+
+    @property
+    def _llm_type(self) -> str:
+        return "llama_cpp"
+
+    def _grammar(self, kwargs: Dict[str, Any]) -> Any:
+        """JSON grammar when called with format="json", as the Ollama backend accepts"""
+        return self._json_grammar if kwargs.get("format") == "json" else None
+    
+    def _call(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> str:
+        # A Llama instance holds a single KV cache, so calls must not overlap
+        with self._lock:
+            result = self._llama.create_completion(
+                prompt,
+                max_tokens=kwargs.get("max_tokens", self.max_tokens),
+                temperature=0,
+                stop=stop,
+                grammar=self._grammar(kwargs)
+            )
+        return result["choices"][0]["text"]
+
+    def _stream(self, prompt: str, stop: Optional[List[str]] = None, run_manager: Any = None, **kwargs: Any) -> Iterator[GenerationChunk]:
+        # Closing this generator stops the generation and releases the lock
+        with self._lock:
+            for part in self._llama.create_completion(
+                prompt,
+                max_tokens=kwargs.get("max_tokens", self.max_tokens),
+                temperature=0,
+                stop=stop,
+                grammar=self._grammar(kwargs),
+                stream=True
+            ):
+                chunk = GenerationChunk(text=part["choices"][0]["text"])
+                if run_manager:
+                    run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+                yield chunk
+
+# Shared by all agents, so every request reuses the same client (or in-process model)
+if HIREFLOW_LLM_BACKEND == "llama_cpp":
+    LLM = LlamaCppLLM(model_path=HIREFLOW_LLAMA_MODEL_PATH, n_threads=OLLAMA_NUM_THREAD)
+    _WARM_UP_KWARGS = {"max_tokens": 1}
+else:
+    LLM = OllamaLLM(
+        model=OLLAMA_MODEL,
+        num_ctx=OLLAMA_NUM_CTX,
+        num_predict=OLLAMA_NUM_PREDICT,
+        temperature=0,
+        num_thread=OLLAMA_NUM_THREAD,
+        keep_alive=OLLAMA_KEEP_ALIVE
+    )
+    # Passing options replaces all defaults; keep the ones that decide how the model is loaded
+    _WARM_UP_KWARGS = {"options": {"num_predict": 1, "num_ctx": OLLAMA_NUM_CTX, "num_thread": OLLAMA_NUM_THREAD}}
+
+# For agents that parse the response as JSON: the model can only emit valid JSON
+JSON_LLM = LLM.bind(format="json")
+
+async def warm_up_llm() -> None:
+    """
+    Load the model into memory with a one-token generation,
+    so the first real request does not pay the model load time
+    """
+    try:
+        await LLM.ainvoke("Hello", **_WARM_UP_KWARGS)
+    except Exception as e:
+        logger.warning("Error warming up the LLM: %s", e)
+
+class _JsonObjectScanner:
+    """
+    Track brace depth over streamed LLM output to find where the first
+    top-level JSON object ends (braces inside strings are ignored)
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.start = None
+        self.end = None
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk of output; returns True once the object is complete"""
+        offset = len(self.text)
+        self.text += chunk
+        for i, char in enumerate(chunk, offset):
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == "{":
+                if self._depth == 0:
+                    self.start = i
+                self._depth += 1
+            elif self._depth == 0:
+                continue
+            elif char == '"':
+                self._in_string = True
+            elif char == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = i + 1
+                    return True
+        return False
+
+    def result(self) -> str:
+        """The complete object, or all output if no object was completed"""
+        if self.end is None:
+            return self.text
+        return self.text[self.start:self.end]
+
+def invoke_json(llm: BaseLanguageModel, prompt: str) -> str:
+    """
+    Stream a completion only until its first JSON object is complete.
+    Closing the stream early ends the generation on the server, so tokens
+    the model would emit after the object are never produced.
+
+    Returns:
+        str: The JSON object text, or the whole output if none was completed
+    """
+    scanner = _JsonObjectScanner()
+    stream = llm.stream(prompt)
+    try:
+        for chunk in stream:
+            if scanner.feed(chunk):
+                break
+    finally:
+        stream.close()
+    return scanner.result()
+
+async def ainvoke_json(llm: BaseLanguageModel, prompt: str) -> str:
+    """Async version of invoke_json"""
+    scanner = _JsonObjectScanner()
+    stream = llm.astream(prompt)
+    try:
+        async for chunk in stream:
+            if scanner.feed(chunk):
+                break
+    finally:
+        await stream.aclose()
+    return scanner.result()
+
+async def abatch_json(llm: BaseLanguageModel, prompts: List[str], max_concurrency: int) -> List[Union[str, Exception]]:
+    """
+    Run ainvoke_json for several prompts concurrently
+
+    Returns:
+        List of JSON texts, with the exception in place of any failed prompt
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    
+    async def run(prompt: str) -> str:
+        async with semaphore:
+            return await ainvoke_json(llm, prompt)
+    
+    return await asyncio.gather(*(run(prompt) for prompt in prompts), return_exceptions=True)
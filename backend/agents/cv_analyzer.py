@@ -1,118 +1,219 @@
-import re
-from typing import Dict, List, Any
-from langchain_community.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import os
+import logging
+import orjson
+from typing import Dict, List, Any, Optional
+import numpy as np
+from langchain_core.runnables import RunnableLambda
+from agents._llm import JSON_LLM, invoke_json, abatch_json
+from utils.response_cache import make_cache_key, get_cached, set_cached
+from utils.semantic_cache import SemanticCache
+from utils.vector_store import embedding_model
+from utils.interning import intern_fields
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent LLM requests; keep in line with the Ollama server's OLLAMA_NUM_PARALLEL
+MAX_CONCURRENCY = int(os.getenv("OLLAMA_NUM_PARALLEL", 8))
+
+# Shorter inputs (after stripping whitespace) cannot be a real CV
+MIN_CV_LENGTH = 80
+
+# Cosine similarity above which two CVs are treated as the same input. Off unless set: CVs written
+# on the same template can be that similar, so only skills and experience are reused from a match
+CV_SIMILARITY_THRESHOLD = os.getenv("HIREFLOW_CV_SIMILARITY_THRESHOLD")
+
+# Shared across agent instances, which are created per request
+semantic_cache = SemanticCache(embedding_model, threshold=float(CV_SIMILARITY_THRESHOLD)) if CV_SIMILARITY_THRESHOLD else None
+
+# Static instructions go first and the CV last, so every request shares the same
+# prompt prefix and the LLM server can reuse its cached attention state for it
+SYSTEM_PREAMBLE = """
+You are an expert CV/resume analyzer. Extract structured information from the CV/resume text given at the end.
+
+Please extract and provide the following information:
+
+1. Candidate's name
+2. Contact information (email, phone)
+3. Skills (technical and soft skills)
+4. Work experience (job titles, companies, dates, responsibilities)
+5. Education (degrees, institutions, dates)
+6. Certifications or special qualifications
+
+Format your response as a JSON object with the following keys:
+- name (string)
+- contact (object with email and phone as strings)
+- skills (array of strings)
+- experience (array of objects, each with title, company, dates, and responsibilities)
+- education (array of objects, each with degree, institution, and dates)
+- certifications (array of strings)
+"""
+
+USER_BODY = """
+CV/RESUME TEXT:
+{cv_text}
+"""
 
 class CVAnalyzerAgent:
     def __init__(self):
-        # Initialize Ollama LLM
-        self.llm = Ollama(model="llama3.2:1b")
+        # Shared Ollama LLM client, constrained to emit valid JSON
+        self.llm = JSON_LLM
         
-        # Create prompt template for CV analysis
-        self.prompt_template = PromptTemplate(
-            input_variables=["cv_text"],
-            template="""
-            You are an expert CV/resume analyzer. Extract structured information from the following CV/resume text.
-            
-            CV/RESUME TEXT:
-            {cv_text}
-            
-            Please extract and provide the following information:
-            
-            1. Candidate's name
-            2. Contact information (email, phone)
-            3. Skills (technical and soft skills)
-            4. Work experience (job titles, companies, dates, responsibilities)
-            5. Education (degrees, institutions, dates)
-            6. Certifications or special qualifications
-            
-            Format your response as a JSON object with the following keys:
-            - name (string)
-            - contact (object with email and phone as strings)
-            - skills (array of strings)
-            - experience (array of objects, each with title, company, dates, and responsibilities)
-            - education (array of objects, each with degree, institution, and dates)
-            - certifications (array of strings)
-            """
-        )
-        
-        # Create the chain
-        self.chain = LLMChain(llm=self.llm, prompt=self.prompt_template)
+        # JSON mode guarantees well-formed output, so only a response cut off by
+        # the token limit can fail to parse; it comes out as None so it is never cached
+        self.output_parser = RunnableLambda(orjson.loads).with_fallbacks(
+            [RunnableLambda(lambda _: None)]
+        ) | RunnableLambda(self._intern_fields)
+    
+    def _render(self, **inputs: Any) -> str:
+        """Render the CV prompt: the shared preamble followed by the CV text"""
+        return SYSTEM_PREAMBLE + USER_BODY.format_map(inputs)
     
     def analyze(self, cv_text: str) -> Dict[str, Any]:
         """
         Analyze the CV text and extract structured information
         """
-        # Execute the chain
+        # Empty or garbage input would only make the LLM invent data
+        if self._is_blank(cv_text):
+            return self._empty_result()
+        
+        # Identical CVs render identical prompts, so reuse the earlier parsed result
+        prompt = self._render(cv_text=cv_text)
+        cache_key = make_cache_key(prompt)
+        cached_result = self._intern_fields(get_cached(cache_key))
+        if cached_result is not None:
+            return cached_result
+        
+        # Near-duplicate CVs reuse the closest earlier result
+        vector = self._embed(cv_text)
+        if vector is not None:
+            similar_result = semantic_cache.lookup(vector)
+            if similar_result is not None:
+                return self._skills_and_experience(similar_result)
+        
+        # Stream the response and stop generating once the JSON object is complete
         try:
-            result = self.chain.run(cv_text=cv_text)
-            
-            # For a real implementation, we'd parse the JSON response
-            # For simplicity, we'll return mock data if parsing fails
-            import json
-            
-            try:
-                parsed_result = json.loads(result)
-            except json.JSONDecodeError:
-                # Attempt to extract using regex if JSON parsing fails
-                name = re.search(r'"name":\s*"([^"]+)"', result)
-                email = re.search(r'"email":\s*"([^"]+)"', result)
-                skills_section = re.search(r'"skills":\s*\[(.*?)\]', result, re.DOTALL)
-                
-                # Default structure if parsing completely fails
-                parsed_result = {
-                    "name": name.group(1) if name else "Unknown Candidate",
-                    "contact": {
-                        "email": email.group(1) if email else "unknown@example.com",
-                        "phone": "N/A"
-                    },
-                    "skills": self._extract_list_items(skills_section.group(1)) if skills_section else ["Python", "Java", "Communication"],
-                    "experience": [
-                        {
-                            "title": "Software Developer",
-                            "company": "Example Corp",
-                            "dates": "2020-2023",
-                            "responsibilities": ["Developed web applications", "Worked in agile teams"]
-                        }
-                    ],
-                    "education": [
-                        {
-                            "degree": "Bachelor of Science in Computer Science",
-                            "institution": "University Example",
-                            "dates": "2016-2020"
-                        }
-                    ],
-                    "certifications": []
-                }
-            
+            parsed_result = self.output_parser.invoke(invoke_json(self.llm, prompt))
+            if parsed_result is None:
+                return self._empty_result()
+            set_cached(cache_key, parsed_result)
+            if vector is not None:
+                semantic_cache.add(vector, parsed_result)
             return parsed_result
-        except Exception as e:
+        except Exception:
             # Fallback for any errors
-            print(f"Error in CV analysis: {str(e)}")
-            return {
-                "name": "John Smith",
-                "email": "john.smith@example.com",
-                "skills": ["Python", "Java", "SQL", "Problem Solving"],
-                "experience": [
-                    {
-                        "title": "Software Developer",
-                        "company": "Tech Solutions Inc.",
-                        "dates": "2020-2023",
-                        "responsibilities": ["Developed web applications", "Database management"]
-                    }
-                ],
-                "education": [
-                    {
-                        "degree": "BS in Computer Science",
-                        "institution": "University of Technology",
-                        "dates": "2016-2020"
-                    }
-                ],
-                "certifications": ["AWS Certified Developer"]
-            }
+            logger.exception("Error in CV analysis")
+            return self._fallback_result()
     
-    def _extract_list_items(self, text):
-        """Helper function to extract list items from a string"""
-        items = re.findall(r'"([^"]+)"', text)
-        return items if items else []
+    async def analyze_batch(self, cv_texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze several CVs at once, sending all prompts to the LLM concurrently
+        """
+        prompts = [self._render(cv_text=cv_text) for cv_text in cv_texts]
+        cache_keys = [make_cache_key(prompt) for prompt in prompts]
+        parsed_results = [
+            self._empty_result() if self._is_blank(cv_text) else self._intern_fields(get_cached(cache_key))
+            for cv_text, cache_key in zip(cv_texts, cache_keys)
+        ]
+        
+        # Resolve near-duplicates from the semantic cache
+        misses = [i for i, parsed_result in enumerate(parsed_results) if parsed_result is None]
+        vectors = self._embed_many([cv_texts[i] for i in misses])
+        for i, vector in zip(misses, vectors):
+            if vector is not None:
+                parsed_results[i] = self._skills_and_experience(semantic_cache.lookup(vector))
+        vectors = dict(zip(misses, vectors))
+        
+        # Only send the remaining misses to the LLM
+        misses = [i for i, parsed_result in enumerate(parsed_results) if parsed_result is None]
+        results = await abatch_json(self.llm, [prompts[i] for i in misses], MAX_CONCURRENCY)
+        
+        for i, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.error("Error in CV analysis", exc_info=result)
+                parsed_results[i] = self._fallback_result()
+            else:
+                parsed_result = self.output_parser.invoke(result)
+                if parsed_result is None:
+                    parsed_results[i] = self._empty_result()
+                    continue
+                parsed_results[i] = parsed_result
+                set_cached(cache_keys[i], parsed_result)
+                if vectors[i] is not None:
+                    semantic_cache.add(vectors[i], parsed_result)
+        return parsed_results
+    
+    def _is_blank(self, cv_text: str) -> bool:
+        """True if the text is too short or has no letters at all"""
+        stripped = cv_text.strip() if cv_text else ""
+        return len(stripped) < MIN_CV_LENGTH or not any(c.isalpha() for c in stripped)
+    
+    def _empty_result(self) -> Dict[str, Any]:
+        """Structure returned for inputs too short to be a CV, without calling the LLM"""
+        return {
+            "name": "Unknown Candidate",
+            "contact": {"email": "", "phone": ""},
+            "skills": [],
+            "experience": [],
+            "education": [],
+            "certifications": []
+        }
+    
+    def _skills_and_experience(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """A near-duplicate CV's skills and experience, without its candidate's name, contact details or degrees"""
+        if result is None:
+            return None
+        return {**self._empty_result(), "skills": result.get("skills", []), "experience": result.get("experience", [])}
+    
+    def _intern_fields(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Share one copy of each repeated string across parsed CVs"""
+        return intern_fields(
+            result,
+            list_fields=("skills", "certifications"),
+            item_fields={"education": ("degree", "institution"), "experience": ("company", "title")}
+        )
+    
+    def _embed(self, cv_text: str) -> Optional[np.ndarray]:
+        """Embed the CV for the semantic cache, or None if the cache is off or the embedding model is unavailable"""
+        if semantic_cache is None:
+            return None
+        try:
+            return semantic_cache.embed(cv_text)
+        except Exception as e:
+            logger.warning("Error embedding CV: %s", e)
+            return None
+    
+    def _embed_many(self, cv_texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed several CVs in one request for the semantic cache"""
+        if not cv_texts:
+            return []
+        if semantic_cache is None:
+            return [None] * len(cv_texts)
+        try:
+            return list(semantic_cache.embed_many(cv_texts))
+        except Exception as e:
+            logger.warning("Error embedding CVs: %s", e)
+            return [None] * len(cv_texts)
+    
+    def _fallback_result(self) -> Dict[str, Any]:
+        """Default CV structure used when the LLM call fails"""
+        return {
+            "name": "John Smith",
+            "email": "john.smith@example.com",
+            "skills": ["Python", "Java", "SQL", "Problem Solving"],
+            "experience": [
+                {
+                    "title": "Software Developer",
+                    "company": "Tech Solutions Inc.",
+                    "dates": "2020-2023",
+                    "responsibilities": ["Developed web applications", "Database management"]
+                }
+            ],
+            "education": [
+                {
+                    "degree": "BS in Computer Science",
+                    "institution": "University of Technology",
+                    "dates": "2016-2020"
+                }
+            ],
+            "certifications": ["AWS Certified Developer"]
+        }
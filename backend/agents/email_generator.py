@@ -1,39 +1,46 @@
-from typing import List
-from langchain_community.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import os
+import logging
+from typing import Dict, List, Any
+from agents._llm import LLM
+from utils.response_cache import make_cache_key, get_cached, set_cached
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent LLM requests; keep in line with the Ollama server's OLLAMA_NUM_PARALLEL
+MAX_CONCURRENCY = int(os.getenv("OLLAMA_NUM_PARALLEL", 8))
+
+# Static instructions go first and the interview details last, so every request shares
+# the same prompt prefix and the LLM server can reuse its cached attention state for it
+SYSTEM_PREAMBLE = """
+Write a professional email to invite a candidate for a job interview, using the interview details given at the end.
+
+The email should be concise, professional, and include:
+1. A greeting that includes the candidate's name
+2. The purpose of the email (invitation to interview)
+3. Brief mention of the job position
+4. Proposed interview dates and format
+5. A request for the candidate to confirm their availability
+6. A professional closing
+
+Do not include any placeholder text like [Company Name] or [Recruiter Name].
+Use "HireFlow Recruitment Team" as the sender.
+"""
+
+USER_BODY = """
+Candidate Name: {candidate_name}
+Job Title: {job_title}
+Proposed Interview Dates: {proposed_dates}
+Interview Format: {interview_format}
+"""
 
 class EmailGeneratorAgent:
     def __init__(self):
-        # Initialize Ollama LLM
-        self.llm = Ollama(model="llama3.2:1b")
-        
-        # Create prompt template for email generation
-        self.prompt_template = PromptTemplate(
-            input_variables=["candidate_name", "job_title", "proposed_dates", "interview_format"],
-            template="""
-            Write a professional email to invite a candidate for a job interview.
-            
-            Candidate Name: {candidate_name}
-            Job Title: {job_title}
-            Proposed Interview Dates: {proposed_dates}
-            Interview Format: {interview_format}
-            
-            The email should be concise, professional, and include:
-            1. A greeting that includes the candidate's name
-            2. The purpose of the email (invitation to interview)
-            3. Brief mention of the job position
-            4. Proposed interview dates and format
-            5. A request for the candidate to confirm their availability
-            6. A professional closing
-            
-            Do not include any placeholder text like [Company Name] or [Recruiter Name].
-            Use "HireFlow Recruitment Team" as the sender.
-            """
-        )
-        
-        # Create the chain
-        self.chain = LLMChain(llm=self.llm, prompt=self.prompt_template)
+        # Shared Ollama LLM client
+        self.llm = LLM
+    
+    def _render(self, **inputs: Any) -> str:
+        """Render the email prompt: the shared preamble followed by the interview details"""
+        return SYSTEM_PREAMBLE + USER_BODY.format_map(inputs)
     
     def generate_interview_request(self, candidate_name: str, job_title: str, proposed_dates: List[str], interview_format: str) -> str:
         """
@@ -42,21 +49,71 @@ class EmailGeneratorAgent:
         # Format the proposed dates for the template
         dates_formatted = ", ".join(proposed_dates)
         
-        # Execute the chain
+        inputs = {
+            "candidate_name": candidate_name,
+            "job_title": job_title,
+            "proposed_dates": dates_formatted,
+            "interview_format": interview_format
+        }
+        
+        # The same (candidate, job, dates, format) request renders the same prompt
+        prompt = self._render(**inputs)
+        cache_key = make_cache_key(prompt)
+        cached_email = get_cached(cache_key)
+        if cached_email is not None:
+            return cached_email
+        
+        # Generate the email
         try:
-            email_content = self.chain.run(
-                candidate_name=candidate_name,
-                job_title=job_title,
-                proposed_dates=dates_formatted,
-                interview_format=interview_format
-            )
+            email_content = self.llm.invoke(prompt)
+            set_cached(cache_key, email_content)
             return email_content
-        except Exception as e:
+        except Exception:
             # Fallback for any errors
-            print(f"Error in email generation: {str(e)}")
-            
-            # Return a default email template
-            return f"""
+            logger.exception("Error in email generation")
+            return self._fallback_email(candidate_name, job_title, dates_formatted, interview_format)
+    
+    async def generate_interview_requests_batch(self, requests: List[Dict[str, Any]]) -> List[str]:
+        """
+        Generate several interview request emails at once, sending all prompts to the LLM concurrently
+        
+        Args:
+            requests: Dicts with candidate_name, job_title, proposed_dates and interview_format
+        """
+        inputs = [
+            {
+                "candidate_name": request["candidate_name"],
+                "job_title": request["job_title"],
+                "proposed_dates": ", ".join(request["proposed_dates"]),
+                "interview_format": request["interview_format"]
+            }
+            for request in requests
+        ]
+        
+        prompts = [self._render(**inputs_item) for inputs_item in inputs]
+        cache_keys = [make_cache_key(prompt) for prompt in prompts]
+        emails = [get_cached(cache_key) for cache_key in cache_keys]
+        
+        # Only send the cache misses to the LLM
+        misses = [i for i, email in enumerate(emails) if email is None]
+        results = await self.llm.abatch(
+            [prompts[i] for i in misses],
+            config={"max_concurrency": MAX_CONCURRENCY},
+            return_exceptions=True
+        )
+        
+        for i, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.error("Error in email generation", exc_info=result)
+                emails[i] = self._fallback_email(**inputs[i])
+            else:
+                emails[i] = result
+                set_cached(cache_keys[i], result)
+        return emails
+    
+    def _fallback_email(self, candidate_name: str, job_title: str, proposed_dates: str, interview_format: str) -> str:
+        """Default email template used when the LLM call fails"""
+        return f"""
             Subject: Interview Invitation: {job_title} Position
             
             Dear {candidate_name},
@@ -65,7 +122,7 @@ class EmailGeneratorAgent:
             
             Interview Details:
             - Format: {interview_format}
-            - Proposed Dates: {dates_formatted}
+            - Proposed Dates: {proposed_dates}
             
             Please let us know which date and time works best for you, and we will confirm the details.
             
@@ -1,83 +1,183 @@
-import re
-from typing import Dict, List, Any
-from langchain_community.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import os
+import logging
+import orjson
+from typing import Dict, List, Any, Optional
+import numpy as np
+from langchain_core.runnables import RunnableLambda
+from agents._llm import JSON_LLM, invoke_json, abatch_json
+from utils.response_cache import make_cache_key, get_cached, set_cached
+from utils.semantic_cache import SemanticCache
+from utils.vector_store import embedding_model
+from utils.interning import intern_fields
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on concurrent LLM requests; keep in line with the Ollama server's OLLAMA_NUM_PARALLEL
+MAX_CONCURRENCY = int(os.getenv("OLLAMA_NUM_PARALLEL", 8))
+
+# Shorter inputs (after stripping whitespace) cannot be a real job description
+MIN_JOB_DESCRIPTION_LENGTH = 40
+
+# Cosine similarity above which two job descriptions are treated as the same input
+JD_SIMILARITY_THRESHOLD = float(os.getenv("HIREFLOW_JD_SIMILARITY_THRESHOLD", 0.90))
+
+# Shared across agent instances, which are created per request
+semantic_cache = SemanticCache(embedding_model, threshold=JD_SIMILARITY_THRESHOLD)
+
+# Static instructions go first and the job description last, so every request shares the
+# same prompt prefix and the LLM server can reuse its cached attention state for it
+SYSTEM_PREAMBLE = """
+You are an expert job analyzer. Your task is to extract key information from the job description given at the end.
+
+Please analyze this job description and provide the following:
+
+1. A concise summary of the job (max 3 sentences)
+2. Required skills (as a list)
+3. Required years of experience
+4. Required qualifications (education, certifications, etc.)
+
+Format your response as a JSON object with the following keys:
+- summary (string)
+- skills (array of strings)
+- experience (object with minimum_years as number and description as string)
+- qualifications (array of strings)
+"""
+
+USER_BODY = """
+JOB DESCRIPTION:
+{job_description}
+"""
 
 class JobSummarizerAgent:
     def __init__(self):
-        # Initialize Ollama LLM
-        self.llm = Ollama(model="llama3.2:1b")
+        # Shared Ollama LLM client, constrained to emit valid JSON
+        self.llm = JSON_LLM
         
-        # Create prompt template for job summarization
-        self.prompt_template = PromptTemplate(
-            input_variables=["job_description"],
-            template="""
-            You are an expert job analyzer. Your task is to extract key information from the job description below.
-            
-            JOB DESCRIPTION:
-            {job_description}
-            
-            Please analyze this job description and provide the following:
-            
-            1. A concise summary of the job (max 3 sentences)
-            2. Required skills (as a list)
-            3. Required years of experience
-            4. Required qualifications (education, certifications, etc.)
-            
-            Format your response as a JSON object with the following keys:
-            - summary (string)
-            - skills (array of strings)
-            - experience (object with minimum_years as number and description as string)
-            - qualifications (array of strings)
-            """
-        )
-        
-        # Create the chain
-        self.chain = LLMChain(llm=self.llm, prompt=self.prompt_template)
+        # JSON mode guarantees well-formed output, so only a response cut off by
+        # the token limit can fail to parse; it comes out as None so it is never cached
+        self.output_parser = RunnableLambda(orjson.loads).with_fallbacks(
+            [RunnableLambda(lambda _: None)]
+        ) | RunnableLambda(self._intern_fields)
+    
+    def _render(self, **inputs: Any) -> str:
+        """Render the job description prompt: the shared preamble followed by the job description"""
+        return SYSTEM_PREAMBLE + USER_BODY.format_map(inputs)
     
     def summarize(self, job_description: str) -> Dict[str, Any]:
         """
         Summarize the job description and extract key information
         """
-        # Execute the chain
+        # Empty or garbage input would only make the LLM invent data
+        if self._is_blank(job_description):
+            return self._empty_result()
+        
+        # Identical job descriptions render identical prompts, so reuse the earlier parsed result
+        prompt = self._render(job_description=job_description)
+        cache_key = make_cache_key(prompt)
+        cached_result = self._intern_fields(get_cached(cache_key))
+        if cached_result is not None:
+            return cached_result
+        
+        # Near-duplicate job descriptions reuse the closest earlier result
+        vector = self._embed(job_description)
+        if vector is not None:
+            similar_result = semantic_cache.lookup(vector)
+            if similar_result is not None:
+                return similar_result
+        
+        # Stream the response and stop generating once the JSON object is complete
         try:
-            result = self.chain.run(job_description=job_description)
-            
-            # For a real implementation, we'd parse the JSON response
-            # For simplicity, we'll return mock data
-            import json
-            
-            # Handle the case where the LLM doesn't return proper JSON
-            try:
-                parsed_result = json.loads(result)
-            except json.JSONDecodeError:
-                # Fall back to regex parsing if JSON parsing fails
-                summary = re.search(r'"summary":\s*"([^"]+)"', result)
-                skills = re.findall(r'"skills":\s*\[(.*?)\]', result, re.DOTALL)
-                experience = re.search(r'"experience":\s*\{(.*?)\}', result, re.DOTALL)
-                qualifications = re.findall(r'"qualifications":\s*\[(.*?)\]', result, re.DOTALL)
-                
-                # Process extracted data
-                parsed_result = {
-                    "summary": summary.group(1) if summary else "No summary available",
-                    "skills": self._extract_list_items(skills[0]) if skills else [],
-                    "experience": {"minimum_years": 2, "description": "At least 2 years of relevant experience"},
-                    "qualifications": self._extract_list_items(qualifications[0]) if qualifications else []
-                }
-                
+            parsed_result = self.output_parser.invoke(invoke_json(self.llm, prompt))
+            if parsed_result is None:
+                return self._empty_result()
+            set_cached(cache_key, parsed_result)
+            if vector is not None:
+                semantic_cache.add(vector, parsed_result)
             return parsed_result
-        except Exception as e:
+        except Exception:
             # Fallback for any errors
-            print(f"Error in job summarization: {str(e)}")
-            return {
-                "summary": "Software engineering position requiring programming skills and relevant experience.",
-                "skills": ["Python", "Java", "C++", "Database", "Web Development"],
-                "experience": {"minimum_years": 2, "description": "At least 2 years of relevant experience"},
-                "qualifications": ["Bachelor's degree in Computer Science", "Problem-solving skills"]
-            }
+            logger.exception("Error in job summarization")
+            return self._fallback_result()
+    
+    async def summarize_batch(self, job_descriptions: List[str]) -> List[Dict[str, Any]]:
+        """
+        Summarize several job descriptions at once, sending all prompts to the LLM concurrently
+        """
+        prompts = [self._render(job_description=job_description) for job_description in job_descriptions]
+        cache_keys = [make_cache_key(prompt) for prompt in prompts]
+        parsed_results = [
+            self._empty_result() if self._is_blank(job_description) else self._intern_fields(get_cached(cache_key))
+            for job_description, cache_key in zip(job_descriptions, cache_keys)
+        ]
+        
+        # Resolve near-duplicates from the semantic cache
+        misses = [i for i, parsed_result in enumerate(parsed_results) if parsed_result is None]
+        vectors = self._embed_many([job_descriptions[i] for i in misses])
+        for i, vector in zip(misses, vectors):
+            if vector is not None:
+                parsed_results[i] = semantic_cache.lookup(vector)
+        vectors = dict(zip(misses, vectors))
+        
+        # Only send the remaining misses to the LLM
+        misses = [i for i, parsed_result in enumerate(parsed_results) if parsed_result is None]
+        results = await abatch_json(self.llm, [prompts[i] for i in misses], MAX_CONCURRENCY)
+        
+        for i, result in zip(misses, results):
+            if isinstance(result, Exception):
+                logger.error("Error in job summarization", exc_info=result)
+                parsed_results[i] = self._fallback_result()
+            else:
+                parsed_result = self.output_parser.invoke(result)
+                if parsed_result is None:
+                    parsed_results[i] = self._empty_result()
+                    continue
+                parsed_results[i] = parsed_result
+                set_cached(cache_keys[i], parsed_result)
+                if vectors[i] is not None:
+                    semantic_cache.add(vectors[i], parsed_result)
+        return parsed_results
+    
+    def _is_blank(self, job_description: str) -> bool:
+        """True if the text is too short or has no letters at all"""
+        stripped = job_description.strip() if job_description else ""
+        return len(stripped) < MIN_JOB_DESCRIPTION_LENGTH or not any(c.isalpha() for c in stripped)
+    
+    def _empty_result(self) -> Dict[str, Any]:
+        """Structure returned for inputs too short to be a job description, without calling the LLM"""
+        return {
+            "summary": "No summary available",
+            "skills": [],
+            "experience": {"minimum_years": 0, "description": ""},
+            "qualifications": []
+        }
+    
+    def _intern_fields(self, result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Share one copy of each repeated string across parsed job descriptions"""
+        return intern_fields(result, list_fields=("skills", "qualifications"))
+    
+    def _embed(self, job_description: str) -> Optional[np.ndarray]:
+        """Embed the job description for the semantic cache, or None if the embedding model is unavailable"""
+        try:
+            return semantic_cache.embed(job_description)
+        except Exception as e:
+            logger.warning("Error embedding job description: %s", e)
+            return None
+    
+    def _embed_many(self, job_descriptions: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed several job descriptions in one request for the semantic cache"""
+        if not job_descriptions:
+            return []
+        try:
+            return list(semantic_cache.embed_many(job_descriptions))
+        except Exception as e:
+            logger.warning("Error embedding job descriptions: %s", e)
+            return [None] * len(job_descriptions)
     
-    def _extract_list_items(self, text):
-        """Helper function to extract list items from a string"""
-        items = re.findall(r'"([^"]+)"', text)
-        return items if items else []
\ No newline at end of file
+    def _fallback_result(self) -> Dict[str, Any]:
+        """Default job summary used when the LLM call fails"""
+        return {
+            "summary": "Software engineering position requiring programming skills and relevant experience.",
+            "skills": ["Python", "Java", "C++", "Database", "Web Development"],
+            "experience": {"minimum_years": 2, "description": "At least 2 years of relevant experience"},
+            "qualifications": ["Bachelor's degree in Computer Science", "Problem-solving skills"]
+        }
@@ -1,6 +1,21 @@
-from typing import Dict, List, Any
+import re
+from typing import Dict, List, Any, FrozenSet, Tuple
 import numpy as np
 
+# Education level keywords; each named group is a level. The lookahead instead of a
+# trailing \b lets dotted abbreviations such as "B.S.", "M.Sc." and "Ph.D." match.
+_EDUCATION_LEVEL_RE = re.compile(
+    r"\b(?:"
+    r"(?P<phd>ph\.?d|doctorate|doctoral)"
+    r"|(?P<master>masters?|m\.?sc?|m\.?a|m\.?b\.?a|m\.?eng|graduate)"
+    r"|(?P<bachelor>bachelors?|b\.?sc?|b\.?a|b\.?eng|undergraduate|college)"
+    r")(?!\w)",
+    re.IGNORECASE
+)
+
+# Ordering of education levels, lowest first
+_EDUCATION_RANK = {"none": 0, "bachelor": 1, "master": 2, "phd": 3}
+
 class MatcherAgent:
     def __init__(self):
         # Define weights for different matching criteria
@@ -9,6 +24,9 @@ class MatcherAgent:
             "experience": 0.3,
             "education": 0.2
         }
+        
+        # Same weights as plain floats, so scoring does not look them up by key
+        self.weights_tuple = (self.weights["skills"], self.weights["experience"], self.weights["education"])
     
     def calculate_match(self, job: Dict[str, Any], candidate: Dict[str, Any]) -> float:
         """
@@ -22,7 +40,7 @@ class MatcherAgent:
             float: Match score between 0 and 1
         """
         # Calculate skills match
-        skills_match = self._calculate_skills_match(job["skills"], candidate["skills"])
+        skills_match = self._calculate_skills_match(job, candidate)
         
         # Calculate experience match
         experience_match = self._calculate_experience_match(
@@ -37,28 +55,144 @@ class MatcherAgent:
         )
         
         # Calculate weighted score
+        skills_weight, experience_weight, education_weight = self.weights_tuple
         total_score = (
-            skills_match * self.weights["skills"] +
-            experience_match * self.weights["experience"] +
-            education_match * self.weights["education"]
+            skills_match * skills_weight +
+            experience_match * experience_weight +
+            education_match * education_weight
         )
         
         return round(total_score, 2)
     
-    def _calculate_skills_match(self, job_skills: List[str], candidate_skills: List[str]) -> float:
-        """Calculate the match between required skills and candidate skills"""
-        if not job_skills or not candidate_skills:
-            return 0.0
+    def calculate_match_batch(self, job: Dict[str, Any], candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Calculate the match scores between a job and many candidates at once
+        
+        Args:
+            job: Job data including skills, experience, qualifications
+            candidates: Candidate data dicts, as passed to calculate_match
+            
+        Returns:
+            np.ndarray: Match scores between 0 and 1, in the same order as candidates
+        """
+        skills_scores = self._skills_scores(job, candidates)
+        experience_scores = self._experience_scores(job.get("experience", {}), candidates)
+        education_scores = self._education_scores(job.get("qualifications", []), candidates)
+        return np.array(self._weighted_totals(skills_scores, experience_scores, education_scores), dtype=np.float64)
+    
+    def rank(self, job: Dict[str, Any], candidates: List[Dict[str, Any]], threshold: float = 0.0) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Score all candidates against a job and order them by match score
         
-        # Normalize skills (lower case)
-        job_skills_norm = [skill.lower() for skill in job_skills]
-        candidate_skills_norm = [skill.lower() for skill in candidate_skills]
+        Args:
+            job: Job data including skills, experience, qualifications
+            candidates: Candidate data dicts, as passed to calculate_match
+            threshold: Minimum match score to keep a candidate
+            
+        Returns:
+            List of (candidate, match score) pairs, highest score first
+        """
+        # Vectorized passes; scoring is CPU-bound Python, so a thread pool would only contend for the GIL
+        skills_scores = self._skills_scores(job, candidates)
+        experience_scores = self._experience_scores(job.get("experience", {}), candidates)
+        
+        # Prefilter: candidates below the threshold even with a perfect education score
+        # can never be returned, so education (the per-candidate regex part) is only scored
+        # for the rest. The bound is exact, so the result is the same as scoring everyone.
+        best_case_scores = self._weighted_totals(skills_scores, experience_scores, np.ones(len(candidates)))
+        survivors = [i for i, best_case_score in enumerate(best_case_scores) if best_case_score >= threshold]
+        candidates = [candidates[i] for i in survivors]
+        
+        education_scores = self._education_scores(job.get("qualifications", []), candidates)
+        match_scores = self._weighted_totals(skills_scores[survivors], experience_scores[survivors], education_scores)
+        ranked = [(candidate, match_score) for candidate, match_score in zip(candidates, match_scores) if match_score >= threshold]
+        ranked.sort(key=lambda pair: pair[1], reverse=True)
+        return ranked
+    
+    def _weighted_totals(self, skills_scores: np.ndarray, experience_scores: np.ndarray, education_scores: np.ndarray) -> List[float]:
+        """Weighted match scores from the sub-score columns"""
+        # Weighted sum for all candidates in one operation, summed in the same order as
+        # calculate_match and rounded with round() so both give identical scores
+        skills_weight, experience_weight, education_weight = self.weights_tuple
+        total_scores = skills_scores * skills_weight + experience_scores * experience_weight + education_scores * education_weight
+        return [round(total_score, 2) for total_score in total_scores.tolist()]
+    
+    def _calculate_skills_match(self, job: Dict[str, Any], candidate: Dict[str, Any]) -> float:
+        """Calculate the fraction of required skills found in the candidate's skills"""
+        job_skills_norm = self._job_skills_norm(job)
+        if not job_skills_norm or not candidate.get("skills"):
+            return 0.0
         
-        # Count matched skills
-        matched_skills = [skill for skill in candidate_skills_norm if any(job_skill in skill for job_skill in job_skills_norm)]
+        # Skills listed verbatim are found with one set intersection; only the
+        # remaining job skills need a substring scan of all candidate skills
+        exact_matches = self._candidate_skills_set(candidate).intersection(job_skills_norm)
+        matched_skills = len(exact_matches)
+        if matched_skills < len(job_skills_norm):
+            candidate_text = self._candidate_skills_text(candidate)
+            matched_skills += sum(
+                1 for job_skill in job_skills_norm
+                if job_skill not in exact_matches and job_skill in candidate_text
+            )
         
         # Calculate score
-        return len(matched_skills) / len(job_skills) if job_skills else 0.0
+        return matched_skills / len(job_skills_norm)
+    
+    def _skills_scores(self, job: Dict[str, Any], candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """_calculate_skills_match for many candidates at once"""
+        job_skills_norm = self._job_skills_norm(job)
+        if not job_skills_norm or not candidates:
+            return np.zeros(len(candidates))
+        
+        # All candidates' skill texts in one string, separated by a character no skill contains;
+        # starts[i] is the offset where candidate i's text begins
+        candidate_texts = [self._candidate_skills_text(candidate) for candidate in candidates]
+        corpus = "\0".join(candidate_texts)
+        starts = np.cumsum([0] + [len(text) + 1 for text in candidate_texts[:-1]])
+        
+        # (candidates, job skills) matrix of substring hits, one C-level scan of the corpus per job
+        # skill; an exact match is also a substring hit, so this covers both checks of the scalar version
+        hits = np.zeros((len(candidates), len(job_skills_norm)), dtype=bool)
+        for j, job_skill in enumerate(job_skills_norm):
+            positions = [match.start() for match in re.finditer(re.escape(job_skill), corpus)]
+            if positions:
+                hits[np.searchsorted(starts, positions, side="right") - 1, j] = True
+        
+        # Fraction of required skills found, per candidate
+        return hits.sum(axis=1) / len(job_skills_norm)
+    
+    def _job_skills_norm(self, job: Dict[str, Any]) -> Tuple[str, ...]:
+        """Lower-cased, de-duplicated job skills, computed once per job dict"""
+        job_skills_norm = job.get("_skills_norm")
+        if job_skills_norm is None:
+            job_skills_norm = tuple(dict.fromkeys(skill.lower() for skill in job.get("skills") or () if skill))
+            job["_skills_norm"] = job_skills_norm
+        return job_skills_norm
+    
+    def _candidate_skills_norm(self, candidate: Dict[str, Any]) -> Tuple[str, ...]:
+        """Lower-cased candidate skills, computed once per candidate dict"""
+        candidate_skills_norm = candidate.get("_skills_norm")
+        if candidate_skills_norm is None:
+            # The analyzer may store skills as null
+            candidate_skills_norm = tuple(skill.lower() for skill in candidate.get("skills") or ())
+            candidate["_skills_norm"] = candidate_skills_norm
+        return candidate_skills_norm
+    
+    def _candidate_skills_set(self, candidate: Dict[str, Any]) -> FrozenSet[str]:
+        """Lower-cased candidate skills as a set, computed once per candidate dict"""
+        candidate_skills_set = candidate.get("_skills_set")
+        if candidate_skills_set is None:
+            candidate_skills_set = frozenset(self._candidate_skills_norm(candidate))
+            candidate["_skills_set"] = candidate_skills_set
+        return candidate_skills_set
+    
+    def _candidate_skills_text(self, candidate: Dict[str, Any]) -> str:
+        """All lower-cased candidate skills in one string, computed once per candidate dict"""
+        candidate_text = candidate.get("_skills_text")
+        if candidate_text is None:
+            # The newline separator keeps a job skill from matching across two adjacent candidate skills
+            candidate_text = "\n".join(self._candidate_skills_norm(candidate))
+            candidate["_skills_text"] = candidate_text
+        return candidate_text
     
     def _calculate_experience_match(self, job_experience: Dict[str, Any], candidate_experience: List[Dict[str, Any]]) -> float:
         """Calculate the match between required experience and candidate experience"""
@@ -83,37 +217,58 @@ class MatcherAgent:
         else:
             return candidate_years / required_years
     
+    def _experience_scores(self, job_experience: Dict[str, Any], candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """_calculate_experience_match for many candidates at once"""
+        # Simplified like the scalar version: each job is 1 year
+        candidate_years = np.array([len(candidate.get("experience") or []) for candidate in candidates], dtype=np.float64)
+        if not job_experience:
+            return np.full(len(candidates), 0.5)
+        
+        required_years = job_experience.get("minimum_years", 0)
+        if required_years == 0:
+            scores = np.ones(len(candidates))
+        else:
+            scores = np.where(candidate_years >= required_years, 1.0, candidate_years / required_years)
+        
+        # Neutral score if missing data
+        scores[candidate_years == 0] = 0.5
+        return scores
+    
+    def _education_scores(self, job_qualifications: List[str], candidates: List[Dict[str, Any]]) -> np.ndarray:
+        """_calculate_education_match for many candidates at once"""
+        # The required level is found once for the whole batch
+        if not job_qualifications:
+            return np.full(len(candidates), 0.5)
+        required_level = self._required_education_level(job_qualifications)
+        return np.array([
+            self._score_education(required_level, candidate["education"]) if candidate.get("education") else 0.5
+            for candidate in candidates
+        ], dtype=np.float64)
+    
     def _calculate_education_match(self, job_qualifications: List[str], candidate_education: List[Dict[str, Any]]) -> float:
         """Calculate the match between required qualifications and candidate education"""
         if not job_qualifications or not candidate_education:
             return 0.5  # Neutral score if missing data
         
-        # Extract education levels from qualifications
-        education_keywords = {
-            "bachelor": ["bachelor", "bs", "ba", "undergraduate", "college"],
-            "master": ["master", "ms", "ma", "graduate"],
-            "phd": ["phd", "doctorate", "doctoral"]
-        }
-        
-        # Find required education level
-        required_level = "none"
+        return self._score_education(self._required_education_level(job_qualifications), candidate_education)
+    
+    def _required_education_level(self, job_qualifications: List[str]) -> str:
+        """Find the education level required by the job qualifications"""
+        # The first qualification naming a level decides; "Master's or PhD" requires a master's
         for qual in job_qualifications:
-            qual_lower = qual.lower()
-            for level, keywords in education_keywords.items():
-                if any(keyword in qual_lower for keyword in keywords):
-                    required_level = level
-                    break
-            if required_level != "none":
-                break
-        
+            levels = {match.lastgroup for match in _EDUCATION_LEVEL_RE.finditer(qual)}
+            if levels:
+                return min(levels, key=_EDUCATION_RANK.get)
+        return "none"
+    
+    def _score_education(self, required_level: str, candidate_education: List[Dict[str, Any]]) -> float:
+        """Score the candidate's highest education level against the required level"""
         # Find candidate's highest education level
         candidate_level = "none"
         for edu in candidate_education:
-            degree_lower = edu.get("degree", "").lower()
-            for level, keywords in education_keywords.items():
-                if any(keyword in degree_lower for keyword in keywords):
-                    if level == "phd" or (level == "master" and candidate_level != "phd") or (level == "bachelor" and candidate_level == "none"):
-                        candidate_level = level
+            for match in _EDUCATION_LEVEL_RE.finditer(edu.get("degree", "")):
+                if _EDUCATION_RANK[match.lastgroup] > _EDUCATION_RANK[candidate_level]:
+                    candidate_level = match.lastgroup
             
         # Score based on education level
         education_scores = {
@@ -123,27 +278,19 @@ class MatcherAgent:
             "phd": 1.0
         }
         
-        education_requirements = {
-            "none": ["none", "bachelor", "master", "phd"],
-            "bachelor": ["bachelor", "master", "phd"],
-            "master": ["master", "phd"],
-            "phd": ["phd"]
-        }
-        
         # Check if candidate meets the education requirement
-        if candidate_level in education_requirements.get(required_level, []):
+        if _EDUCATION_RANK[candidate_level] >= _EDUCATION_RANK[required_level]:
             return 1.0
         else:
             return education_scores.get(candidate_level, 0.0)
     
     def get_matching_skills(self, job: Dict[str, Any], candidate: Dict[str, Any]) -> List[str]:
         """Get the list of skills that match between the job and the candidate"""
-        job_skills_norm = [skill.lower() for skill in job["skills"]]
-        candidate_skills_norm = [skill.lower() for skill in candidate["skills"]]
+        job_skills_norm = self._job_skills_norm(job)
         
         matched_skills = []
-        for candidate_skill in candidate["skills"]:
-            if any(job_skill in candidate_skill.lower() for job_skill in job_skills_norm):
+        for candidate_skill, candidate_skill_norm in zip(candidate.get("skills") or (), self._candidate_skills_norm(candidate)):
+            if any(job_skill in candidate_skill_norm for job_skill in job_skills_norm):
                 matched_skills.append(candidate_skill)
                 
         return matched_skills
\ No newline at end of file
@@ -1,22 +1,42 @@
 # app.py - Main FastAPI application
 
 import os
+import re
 import uuid
-import json
+import orjson
+import logging
+import sqlite3
 from typing import List, Dict, Any, Optional
-from fastapi import FastAPI, File, UploadFile, HTTPException, Body
+from fastapi import FastAPI, File, UploadFile, HTTPException, Body, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from datetime import datetime
 
 # Import our core modules
-from database.db_manager import init_db, get_db_connection
+from database.db_manager import init_db, get_db
 from agents.job_summarizer import JobSummarizerAgent
 from agents.cv_analyzer import CVAnalyzerAgent
 from agents.matcher import MatcherAgent
 from agents.email_generator import EmailGeneratorAgent
+from agents._llm import warm_up_llm
 from utils.pdf_parser import extract_text_from_pdf
-from utils.vector_store import add_cv_to_vector_store, search_similar_cvs
+from utils.vector_store import add_cv_to_vector_store, add_cvs_to_vector_store, search_similar_cvs, save_vector_store
+
+# Configure logging once for all modules; agents only log errors and warnings
+logging.basicConfig(
+    level=os.getenv("HIREFLOW_LOG_LEVEL", "WARNING"),
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+# Skills section of a CV chunk (up to the next "Skills" or "Certifications" heading)
+# and the text after the first dash of each line in it, used by /matchcv
+_SKILLS_RE = re.compile(r"Skills(.*?)(?:Skills|Certifications|\Z)", re.S)
+_BULLET_RE = re.compile(r"^[^-\n]*-([^-\n]*)", re.M)
+
+# Score given to every candidate found by the RAG search in /matchcv
+RAG_MATCH_SCORE = 0.8
 
 app = FastAPI(title="HireFlow API", description="AI-powered recruitment system")
 
@@ -29,10 +49,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize database on startup
+# Compress larger JSON responses (job and candidate lists, matches) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Initialize database and load the LLM on startup
 @app.on_event("startup")
 async def startup_event():
     init_db()
+    await warm_up_llm()
+
+# Write the CV index to disk on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    save_vector_store()
 
 # Pydantic models for request/response validation
 class JobDescription(BaseModel):
@@ -55,10 +84,19 @@ class InterviewRequest(BaseModel):
     job_id: str
     proposed_dates: List[str]
     interview_format: str
+
+class MatchBatchRequest(BaseModel):
+    job_ids: List[str]
+    threshold: float = 0.8
     
 # API Endpoints
+@app.api_route("/health", methods=["GET", "HEAD"], response_model=Dict[str, str])
+async def health():
+    # Liveness check that touches neither the database nor the LLM
+    return {"status": "ok"}
+
 @app.post("/jobs", response_model=Dict[str, Any])
-async def create_job(job: JobDescription):
+async def create_job(job: JobDescription, conn: sqlite3.Connection = Depends(get_db)):
     # Initialize the job summarizer agent
     summarizer = JobSummarizerAgent()
     
@@ -66,7 +104,6 @@ async def create_job(job: JobDescription):
     summary_result = summarizer.summarize(job.description)
     
     # Store in database
-    conn = get_db_connection()
     cursor = conn.cursor()
     job_id = str(uuid.uuid4())
     
@@ -80,13 +117,12 @@ async def create_job(job: JobDescription):
             job.title,
             job.description,
             summary_result["summary"],
-            json.dumps(summary_result["skills"]),
-            json.dumps(summary_result["experience"]),
-            json.dumps(summary_result["qualifications"])
+            orjson.dumps(summary_result["skills"]).decode(),
+            orjson.dumps(summary_result["experience"]).decode(),
+            orjson.dumps(summary_result["qualifications"]).decode()
         )
     )
     conn.commit()
-    conn.close()
     
     return {
         "job_id": job_id,
@@ -98,7 +134,7 @@ async def create_job(job: JobDescription):
     }
 
 @app.post("/candidates", response_model=Dict[str, Any])
-async def upload_cv(file: UploadFile = File(...), candidate_name: str = None, candidate_email: str = None):
+async def upload_cv(background_tasks: BackgroundTasks, file: UploadFile = File(...), candidate_name: str = None, candidate_email: str = None, conn: sqlite3.Connection = Depends(get_db)):
     # Extract text from CV
     try:
         cv_text = await extract_text_from_pdf(file)
@@ -112,18 +148,17 @@ async def upload_cv(file: UploadFile = File(...), candidate_name: str = None, ca
     cv_info = analyzer.analyze(cv_text)
     
     # If name not provided, use the one extracted from CV
-    if not candidate_name and "name" in cv_info:
-        candidate_name = cv_info["name"]
+    if not candidate_name:
+        candidate_name = _cv_name(cv_info, file.filename)
     
     # If email not provided, use the one extracted from CV
-    if not candidate_email and "email" in cv_info:
-        candidate_email = cv_info["email"]
+    if not candidate_email:
+        candidate_email = _cv_email(cv_info)
     
     # Generate a candidate ID
     candidate_id = str(uuid.uuid4())
     
     # Store in database
-    conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute(
         """
@@ -136,16 +171,15 @@ async def upload_cv(file: UploadFile = File(...), candidate_name: str = None, ca
             candidate_email,
             cv_text,
             file.filename,
-            json.dumps(cv_info.get("skills", [])),
-            json.dumps(cv_info.get("experience", [])),
-            json.dumps(cv_info.get("education", []))
+            orjson.dumps(cv_info.get("skills", [])).decode(),
+            orjson.dumps(cv_info.get("experience", [])).decode(),
+            orjson.dumps(cv_info.get("education", [])).decode()
         )
     )
     conn.commit()
-    conn.close()
     
-    # Add to vector store for semantic search
-    add_cv_to_vector_store(candidate_id,candidate_name, cv_text)
+    # Add to vector store for semantic search, after the response is sent
+    background_tasks.add_task(add_cv_to_vector_store, candidate_id, candidate_name, cv_text)
     
     return {
         "candidate_id": candidate_id,
@@ -156,79 +190,188 @@ async def upload_cv(file: UploadFile = File(...), candidate_name: str = None, ca
         "education": cv_info.get("education", [])
     }
 
+def _cv_name(cv_info: Dict[str, Any], filename: Optional[str]) -> str:
+    """Candidate name extracted from a CV, else the uploaded file's name without extension"""
+    return cv_info.get("name") or os.path.splitext(os.path.basename(filename or ""))[0] or "Unknown Candidate"
+
+def _cv_email(cv_info: Dict[str, Any]) -> Optional[str]:
+    """Email address extracted from a CV; the analyzer puts it under contact"""
+    return (cv_info.get("contact") or {}).get("email") or cv_info.get("email")
+
+@app.post("/candidates/batch", response_model=List[Dict[str, Any]])
+async def upload_cvs(background_tasks: BackgroundTasks, files: List[UploadFile] = File(...), conn: sqlite3.Connection = Depends(get_db)):
+    # Extract text from the CVs one at a time; MuPDF must not run in several threads at once
+    cv_texts = []
+    for file in files:
+        try:
+            cv_texts.append(await extract_text_from_pdf(file))
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"Failed to process PDF {file.filename}: {str(e)}")
+    
+    # Analyze all CVs, with the LLM prompts sent concurrently
+    analyzer = CVAnalyzerAgent()
+    cv_infos = await analyzer.analyze_batch(cv_texts)
+    
+    # Name and email come from each CV, and every candidate gets a new ID
+    candidates = [
+        {
+            "candidate_id": str(uuid.uuid4()),
+            "name": _cv_name(cv_info, file.filename),
+            "email": _cv_email(cv_info),
+            "skills": cv_info.get("skills", []),
+            "experience": cv_info.get("experience", []),
+            "education": cv_info.get("education", [])
+        }
+        for cv_info, file in zip(cv_infos, files)
+    ]
+    
+    # Store all candidates in one statement and transaction
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO candidates (id, name, email, cv_text, cv_filename, skills, experience, education)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    candidate["candidate_id"],
+                    candidate["name"],
+                    candidate["email"],
+                    cv_text,
+                    file.filename,
+                    orjson.dumps(candidate["skills"]).decode(),
+                    orjson.dumps(candidate["experience"]).decode(),
+                    orjson.dumps(candidate["education"]).decode()
+                )
+                for candidate, cv_text, file in zip(candidates, cv_texts, files)
+            ]
+        )
+    
+    # Add to vector store after the response is sent, embedding the chunks of all CVs in one request
+    background_tasks.add_task(add_cvs_to_vector_store, [
+        (candidate["candidate_id"], candidate["name"], cv_text)
+        for candidate, cv_text in zip(candidates, cv_texts)
+    ])
+    
+    return candidates
+
+def _job_data(job: tuple) -> Dict[str, Any]:
+    """Convert a row of SELECT * FROM jobs into the dict the agents use"""
+    return {
+        "id": job[0],
+        "title": job[1],
+        "description": job[2],
+        "summary": job[3],
+        "skills": orjson.loads(job[4]),
+        "experience": orjson.loads(job[5]),
+        "qualifications": orjson.loads(job[6])
+    }
+
+def _candidates_for_matching(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    """Load all candidates with the fields the matcher uses"""
+    # Matching only needs the structured fields, so skip the large cv_text
+    cursor.execute("SELECT id, name, email, skills, experience, education FROM candidates")
+    return [
+        {
+            "id": candidate[0],
+            "name": candidate[1],
+            "email": candidate[2],
+            "skills": orjson.loads(candidate[3]),
+            "experience": orjson.loads(candidate[4]),
+            "education": orjson.loads(candidate[5])
+        }
+        for candidate in cursor.fetchall()
+    ]
+
+def _rank_candidates(matcher: MatcherAgent, job_data: Dict[str, Any], candidates_data: List[Dict[str, Any]], threshold: float) -> List[Dict[str, Any]]:
+    """Score all candidates against a job; those above threshold, highest score first, in response format"""
+    return [
+        {
+            "candidate_id": candidate_data["id"],
+            "name": candidate_data["name"],
+            "email": candidate_data["email"],
+            "match_score": match_score,
+            "matching_skills": matcher.get_matching_skills(job_data, candidate_data)
+        }
+        for candidate_data, match_score in matcher.rank(job_data, candidates_data, threshold)
+    ]
+
 @app.post("/match", response_model=List[Dict[str, Any]])
-async def match_candidates(job_id: str, threshold: float = 0.8):
+async def match_candidates(job_id: str, threshold: float = 0.8, conn: sqlite3.Connection = Depends(get_db)):
     # Get job details
-    conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
     job = cursor.fetchone()
     
     if not job:
-        conn.close()
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_data = {
-        "id": job[0],
-        "title": job[1],
-        "description": job[2],
-        "summary": job[3],
-        "skills": json.loads(job[4]),
-        "experience": json.loads(job[5]),
-        "qualifications": json.loads(job[6])
-    }
+    job_data = _job_data(job)
     
     # Get all candidates
-    cursor.execute("SELECT * FROM candidates")
-    candidates = cursor.fetchall()
-    conn.close()
+    candidates_data = _candidates_for_matching(cursor)
     
     # Initialize matcher agent
     matcher = MatcherAgent()
     
-    # Match each candidate against the job
-    matched_candidates = []
-    for candidate in candidates:
-        candidate_data = {
-            "id": candidate[0],
-            "name": candidate[1],
-            "email": candidate[2],
-            "cv_text": candidate[3],
-            "cv_filename": candidate[4],
-            "skills": json.loads(candidate[5]),
-            "experience": json.loads(candidate[6]),
-            "education": json.loads(candidate[7])
-        }
-        
-        # Calculate match score
-        match_score = matcher.calculate_match(job_data, candidate_data)
-        
-        # Add to results if above threshold
-        if match_score >= threshold:
-            matched_candidates.append({
-                "candidate_id": candidate_data["id"],
-                "name": candidate_data["name"],
-                "email": candidate_data["email"],
-                "match_score": match_score,
-                "matching_skills": matcher.get_matching_skills(job_data, candidate_data)
-            })
+    # Score all candidates in one pass, off the event loop; only those above threshold are returned
+    matched_candidates = await run_in_threadpool(_rank_candidates, matcher, job_data, candidates_data, threshold)
     
-    # Update match score in database
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    for candidate in matched_candidates:
-        cursor.execute(
+    # Update match scores in database, all rows in one statement and transaction
+    matched_at = datetime.now().isoformat()
+    with conn:
+        conn.executemany(
             "INSERT OR REPLACE INTO job_matches (job_id, candidate_id, match_score, matched_at) VALUES (?, ?, ?, ?)",
-            (job_id, candidate["candidate_id"], candidate["match_score"], datetime.now().isoformat())
+            [(job_id, candidate["candidate_id"], candidate["match_score"], matched_at) for candidate in matched_candidates]
         )
-    conn.commit()
-    conn.close()
-    
-    # Sort by match score (highest first)
-    matched_candidates.sort(key=lambda x: x["match_score"], reverse=True)
     
+    # Already sorted by match score (highest first)
     return matched_candidates
 
+@app.post("/match/batch", response_model=Dict[str, List[Dict[str, Any]]])
+async def match_candidates_batch(request: MatchBatchRequest, conn: sqlite3.Connection = Depends(get_db)):
+    # Get all jobs in one query
+    cursor = conn.cursor()
+    cursor.execute(
+        f"SELECT * FROM jobs WHERE id IN ({','.join('?' * len(request.job_ids))})",
+        request.job_ids
+    )
+    jobs_by_id = {job[0]: job for job in cursor.fetchall()}
+    
+    missing_job_ids = [job_id for job_id in request.job_ids if job_id not in jobs_by_id]
+    if missing_job_ids:
+        raise HTTPException(status_code=404, detail=f"Jobs not found: {', '.join(missing_job_ids)}")
+    
+    jobs_data = [_job_data(jobs_by_id[job_id]) for job_id in dict.fromkeys(request.job_ids)]
+    
+    # Candidates are loaded once and shared by all jobs
+    candidates_data = _candidates_for_matching(cursor)
+    
+    # Initialize matcher agent
+    matcher = MatcherAgent()
+    
+    # Rank candidates for every job in one trip to the thread pool
+    matches_by_job = await run_in_threadpool(
+        lambda: {
+            job_data["id"]: _rank_candidates(matcher, job_data, candidates_data, request.threshold)
+            for job_data in jobs_data
+        }
+    )
+    
+    # Update match scores for all jobs in one statement and transaction
+    matched_at = datetime.now().isoformat()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO job_matches (job_id, candidate_id, match_score, matched_at) VALUES (?, ?, ?, ?)",
+            [
+                (job_id, candidate["candidate_id"], candidate["match_score"], matched_at)
+                for job_id, matched_candidates in matches_by_job.items()
+                for candidate in matched_candidates
+            ]
+        )
+    
+    return matches_by_job
+
 # @app.post("/matchcv")
 # async def match_cand(job_id: str, threshold: float = 0.8):
 #     conn = get_db_connection()
@@ -260,15 +403,13 @@ async def match_candidates(job_id: str, threshold: float = 0.8):
 #     return res
 
 @app.post("/matchcv", response_model=List[Dict[str, Any]])
-async def match_cv(job_id: str, threshold: float = 0.7):
+async def match_cv(job_id: str, threshold: float = 0.7, conn: sqlite3.Connection = Depends(get_db)):
     # Get job details
-    conn = get_db_connection()
     cursor = conn.cursor()
     cursor.execute("SELECT * FROM jobs WHERE id = ?", (job_id,))
     job = cursor.fetchone()
     
     if not job:
-        conn.close()
         raise HTTPException(status_code=404, detail="Job not found")
     
     job_data = {
@@ -276,9 +417,9 @@ async def match_cv(job_id: str, threshold: float = 0.7):
         "title": job[1],
         "description": job[2],
         "summary": job[3],
-        "skills": json.loads(job[4]),
-        "experience": json.loads(job[5]),
-        "qualifications": json.loads(job[6])
+        "skills": orjson.loads(job[4]),
+        "experience": orjson.loads(job[5]),
+        "qualifications": orjson.loads(job[6])
     }
     
     # Search for similar CVs using RAG
@@ -291,7 +432,7 @@ async def match_cv(job_id: str, threshold: float = 0.7):
     # Group by candidate_id to avoid duplicates
     for doc in docs:
         candidate_id = doc.metadata.get('candidate_id')
-        match_score = 0.8  # Default score - in a real implementation, use doc.score
+        match_score = RAG_MATCH_SCORE  # Default score - in a real implementation, use doc.score
         
         if candidate_id not in candidate_matches:
             candidate_matches[candidate_id] = {
@@ -310,52 +451,51 @@ async def match_cv(job_id: str, threshold: float = 0.7):
     # Filter by threshold
     matched_candidates = [c for c in matched_candidates if c["match_score"] >= threshold]
     
-    # Get additional info for each candidate from database
+    # Get additional info for all candidates from database in one query
+    candidate_ids = [candidate["candidate_id"] for candidate in matched_candidates]
+    cursor.execute(
+        f"SELECT id, name, email, skills FROM candidates WHERE id IN ({','.join('?' * len(candidate_ids))})",
+        candidate_ids
+    )
+    rows_by_id = {row[0]: row[1:] for row in cursor.fetchall()}
+    
+    # The vector store can still hold CVs of candidates deleted from the database;
+    # their ids would also violate the job_matches foreign key
+    matched_candidates = [candidate for candidate in matched_candidates if candidate["candidate_id"] in rows_by_id]
+    
     for candidate in matched_candidates:
-        cursor.execute("SELECT name, email, skills FROM candidates WHERE id = ?", (candidate["candidate_id"],))
-        result = cursor.fetchone()
-        if result:
-            candidate["name"] = result[0]
-            candidate["email"] = result[1]
-            
-            # Extract skills from CV content or use from database
-            skills = []
+        result = rows_by_id[candidate["candidate_id"]]
+        candidate["name"] = result[0]
+        candidate["email"] = result[1]
+        
+        # Use the skills stored for the candidate; only parse the CV content if there are none
+        skills = orjson.loads(result[2]) if result[2] else []
+        if not skills:
             for content in candidate["content"]:
-                if "Skills" in content:
-                    skills_section = content.split("Skills")[1].split("Certifications")[0] if "Certifications" in content else content.split("Skills")[1]
-                    # Extract skills mentioned after "Skills" heading
-                    skill_lines = skills_section.strip().split('\n')
-                    for line in skill_lines:
-                        if '-' in line:
-                            skill = line.split('-')[1].strip() if len(line.split('-')) > 1 else line.strip()
-                            skills.append(skill)
-            
-            # If no skills extracted, use from database
-            if not skills and result[2]:
-                skills = json.loads(result[2])
-            
-            candidate["matching_skills"] = skills[:5]  # Get top 5 skills
+                section = _SKILLS_RE.search(content)
+                if section:
+                    skills.extend(skill.strip() for skill in _BULLET_RE.findall(section.group(1)))
+        
+        candidate["matching_skills"] = skills[:5]  # Get top 5 skills
     
     # Remove the content field as it's not needed in the response
     for candidate in matched_candidates:
         if "content" in candidate:
             del candidate["content"]
     
-    # Update match score in database
-    for candidate in matched_candidates:
-        cursor.execute(
+    # Update match scores in database, all rows in one statement and transaction
+    matched_at = datetime.now().isoformat()
+    with conn:
+        conn.executemany(
             "INSERT OR REPLACE INTO job_matches (job_id, candidate_id, match_score, matched_at) VALUES (?, ?, ?, ?)",
-            (job_id, candidate["candidate_id"], candidate["match_score"], datetime.now().isoformat())
+            [(job_id, candidate["candidate_id"], candidate["match_score"], matched_at) for candidate in matched_candidates]
         )
-    conn.commit()
-    conn.close()
     
     return matched_candidates
 
 @app.post("/interview-requests", response_model=Dict[str, Any])
-async def send_interview_request(request: InterviewRequest):
+async def send_interview_request(request: InterviewRequest, conn: sqlite3.Connection = Depends(get_db)):
     # Get candidate and job details
-    conn = get_db_connection()
     cursor = conn.cursor()
     
     cursor.execute("SELECT * FROM candidates WHERE id = ?", (request.candidate_id,))
@@ -365,7 +505,6 @@ async def send_interview_request(request: InterviewRequest):
     job = cursor.fetchone()
     
     if not candidate or not job:
-        conn.close()
         raise HTTPException(status_code=404, detail="Candidate or job not found")
     
     candidate_data = {
@@ -401,14 +540,13 @@ async def send_interview_request(request: InterviewRequest):
             request.candidate_id,
             request.job_id,
             email_content,
-            json.dumps(request.proposed_dates),
+            orjson.dumps(request.proposed_dates).decode(),
             request.interview_format,
             "pending",
             datetime.now().isoformat()
         )
     )
     conn.commit()
-    conn.close()
     
     # In a real application, we would send the email here
     # For now, we'll just return the email content
@@ -420,26 +558,110 @@ async def send_interview_request(request: InterviewRequest):
         "status": "pending"
     }
 
+@app.post("/interview-requests/batch", response_model=List[Dict[str, Any]])
+async def send_interview_requests(requests: List[InterviewRequest], conn: sqlite3.Connection = Depends(get_db)):
+    # Get all candidates and jobs in one query each
+    cursor = conn.cursor()
+    candidate_ids = list(dict.fromkeys(request.candidate_id for request in requests))
+    cursor.execute(
+        f"SELECT id, name, email FROM candidates WHERE id IN ({','.join('?' * len(candidate_ids))})",
+        candidate_ids
+    )
+    candidates_by_id = {candidate[0]: candidate for candidate in cursor.fetchall()}
+    
+    job_ids = list(dict.fromkeys(request.job_id for request in requests))
+    cursor.execute(
+        f"SELECT id, title FROM jobs WHERE id IN ({','.join('?' * len(job_ids))})",
+        job_ids
+    )
+    jobs_by_id = {job[0]: job for job in cursor.fetchall()}
+    
+    if any(request.candidate_id not in candidates_by_id or request.job_id not in jobs_by_id for request in requests):
+        raise HTTPException(status_code=404, detail="Candidate or job not found")
+    
+    # Generate all emails, with the LLM prompts sent concurrently
+    email_generator = EmailGeneratorAgent()
+    email_contents = await email_generator.generate_interview_requests_batch([
+        {
+            "candidate_name": candidates_by_id[request.candidate_id][1],
+            "job_title": jobs_by_id[request.job_id][1],
+            "proposed_dates": request.proposed_dates,
+            "interview_format": request.interview_format
+        }
+        for request in requests
+    ])
+    
+    # Store all requests in one statement and transaction
+    request_ids = [str(uuid.uuid4()) for _ in requests]
+    created_at = datetime.now().isoformat()
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO interview_requests 
+            (id, candidate_id, job_id, email_content, proposed_dates, interview_format, status, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            [
+                (
+                    request_id,
+                    request.candidate_id,
+                    request.job_id,
+                    email_content,
+                    orjson.dumps(request.proposed_dates).decode(),
+                    request.interview_format,
+                    "pending",
+                    created_at
+                )
+                for request_id, request, email_content in zip(request_ids, requests, email_contents)
+            ]
+        )
+    
+    return [
+        {
+            "request_id": request_id,
+            "candidate_email": candidates_by_id[request.candidate_id][2],
+            "email_content": email_content,
+            "status": "pending"
+        }
+        for request_id, request, email_content in zip(request_ids, requests, email_contents)
+    ]
+
 @app.get("/jobs", response_model=List[Dict[str, Any]])
-async def list_jobs():
-    conn = get_db_connection()
+async def list_jobs(conn: sqlite3.Connection = Depends(get_db)):
     cursor = conn.cursor()
     cursor.execute("SELECT id, title, summary FROM jobs")
     jobs = cursor.fetchall()
-    conn.close()
     
     return [{"id": job[0], "title": job[1], "summary": job[2]} for job in jobs]
 
 @app.get("/candidates", response_model=List[Dict[str, Any]])
-async def list_candidates():
-    conn = get_db_connection()
+async def list_candidates(conn: sqlite3.Connection = Depends(get_db)):
     cursor = conn.cursor()
     cursor.execute("SELECT id, name, email FROM candidates")
     candidates = cursor.fetchall()
-    conn.close()
     
     return [{"id": c[0], "name": c[1], "email": c[2]} for c in candidates]
 
+@app.get("/jobs/match-counts", response_model=Dict[str, int])
+async def job_match_counts(threshold: float = 0.3, conn: sqlite3.Connection = Depends(get_db)):
+    # Number of candidates /matchcv would return for each job, without storing the matches
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, description FROM jobs")
+    jobs = cursor.fetchall()
+    
+    # Every RAG match gets the same score, so the threshold either keeps all of them or none
+    if threshold > RAG_MATCH_SCORE:
+        return {job[0]: 0 for job in jobs}
+    
+    def count_matches():
+        return {
+            job[0]: len({doc.metadata.get('candidate_id') for doc in search_similar_cvs(job[1], top_k=5)})
+            for job in jobs
+        }
+    
+    # The searches call the embedding model, so keep them off the event loop
+    return await run_in_threadpool(count_matches)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
@@ -1,13 +1,21 @@
 import sqlite3
 import os
+import threading
 
 DB_PATH = "hireflow.db"
 
+# One connection per thread, reused across requests
+_local = threading.local()
+
 def init_db():
     """Initialize the database schema if it doesn't exist"""
-    conn = get_db_connection()
+    conn = _connect()
     cursor = conn.cursor()
     
+    # Write-ahead logging lets readers proceed while a write is in progress;
+    # the setting is stored in the database file, so it only needs to be set once
+    cursor.execute("PRAGMA journal_mode=WAL")
+    
     # Create tables
     cursor.executescript('''
     -- Jobs table
@@ -59,13 +67,52 @@ def init_db():
         FOREIGN KEY (candidate_id) REFERENCES candidates (id),
         FOREIGN KEY (job_id) REFERENCES jobs (id)
     );
+    
+    -- Indexes for lookups not covered by the primary keys
+    CREATE INDEX IF NOT EXISTS idx_matches_candidate ON job_matches (candidate_id);
+    CREATE INDEX IF NOT EXISTS idx_matches_score ON job_matches (job_id, match_score DESC);
+    CREATE INDEX IF NOT EXISTS idx_candidates_email ON candidates (email);
+    CREATE INDEX IF NOT EXISTS idx_jobs_title ON jobs (title);
     ''')
     
     conn.commit()
     conn.close()
 
 def get_db_connection():
-    """Get a database connection"""
+    """Get this thread's database connection, opening it on first use"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+    return conn
+
+async def get_db():
+    """
+    FastAPI dependency providing the database connection
+
+    Async, so it runs on the event loop thread like the endpoints that use it.
+    Uncommitted writes are rolled back if the request fails, so they cannot
+    leak into the next request's commit on the shared connection.
+    """
+    conn = get_db_connection()
+    try:
+        yield conn
+    except Exception:
+        conn.rollback()
+        raise
+
+def _connect():
+    """Open a new database connection with the per-connection settings applied"""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    
+    # Per-connection settings: fewer fsyncs (safe with WAL), wait for locks instead
+    # of failing, enforce foreign keys, and keep temp data and a 20 MB page cache in memory
+    conn.executescript('''
+    PRAGMA synchronous=NORMAL;
+    PRAGMA busy_timeout=5000;
+    PRAGMA foreign_keys=ON;
+    PRAGMA temp_store=MEMORY;
+    PRAGMA cache_size=-20000;
+    ''')
     return conn
\ No newline at end of file
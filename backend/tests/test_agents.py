@@ -0,0 +1,91 @@
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# The response cache lives in the working directory
+os.chdir(tempfile.mkdtemp())
+
+from agents import cv_analyzer, job_summarizer
+from utils.response_cache import make_cache_key, get_cached
+
+CV_TEXT = "Jane Doe, jane@example.com. Software engineer with five years of Python, SQL and AWS experience."
+JOB_DESCRIPTION = "Backend engineer with three years of Python and SQL, building APIs."
+
+# A JSON object cut off by the token limit
+TRUNCATED = '{"name": "Jane Doe", "skills": ["Pyth'
+
+class TruncatedResponseTest(unittest.TestCase):
+    """LLM responses that fail to parse fall back to the empty result without being cached"""
+
+    def setUp(self):
+        for module in (cv_analyzer, job_summarizer):
+            patcher = mock.patch.object(module, "semantic_cache", mock.Mock(**{"lookup.return_value": None}))
+            self.addCleanup(patcher.stop)
+            patcher.start()
+
+    def assert_not_cached(self, prompt, module):
+        self.assertIsNone(get_cached(make_cache_key(prompt)))
+        module.semantic_cache.add.assert_not_called()
+
+    def test_analyze(self):
+        agent = cv_analyzer.CVAnalyzerAgent()
+        with mock.patch.object(cv_analyzer, "invoke_json", return_value=TRUNCATED), \
+                mock.patch.object(agent, "_embed", return_value=[1.0]):
+            self.assertEqual(agent.analyze(CV_TEXT), agent._empty_result())
+        self.assert_not_cached(agent._render(cv_text=CV_TEXT), cv_analyzer)
+
+    def test_analyze_batch(self):
+        agent = cv_analyzer.CVAnalyzerAgent()
+        with mock.patch.object(cv_analyzer, "abatch_json", mock.AsyncMock(return_value=[TRUNCATED])), \
+                mock.patch.object(agent, "_embed_many", return_value=[None]):
+            self.assertEqual(asyncio.run(agent.analyze_batch([CV_TEXT + " "])), [agent._empty_result()])
+        self.assert_not_cached(agent._render(cv_text=CV_TEXT + " "), cv_analyzer)
+
+    def test_summarize(self):
+        agent = job_summarizer.JobSummarizerAgent()
+        with mock.patch.object(job_summarizer, "invoke_json", return_value=TRUNCATED), \
+                mock.patch.object(agent, "_embed", return_value=[1.0]):
+            self.assertEqual(agent.summarize(JOB_DESCRIPTION), agent._empty_result())
+        self.assert_not_cached(agent._render(job_description=JOB_DESCRIPTION), job_summarizer)
+
+    def test_summarize_batch(self):
+        agent = job_summarizer.JobSummarizerAgent()
+        with mock.patch.object(job_summarizer, "abatch_json", mock.AsyncMock(return_value=[TRUNCATED])), \
+                mock.patch.object(agent, "_embed_many", return_value=[None]):
+            self.assertEqual(asyncio.run(agent.summarize_batch([JOB_DESCRIPTION + " "])), [agent._empty_result()])
+        self.assert_not_cached(agent._render(job_description=JOB_DESCRIPTION + " "), job_summarizer)
+
+class SimilarCVTest(unittest.TestCase):
+    """Results reused from the semantic cache for a near-duplicate CV"""
+
+    OTHER_RESULT = {
+        "name": "John Roe",
+        "contact": {"email": "john@example.com", "phone": "555 0100"},
+        "skills": ["Python", "SQL"],
+        "experience": [{"title": "Engineer", "company": "Acme"}],
+        "education": [{"degree": "BSc Computer Science"}],
+        "certifications": ["AWS"]
+    }
+
+    def test_off_by_default(self):
+        self.assertIsNone(cv_analyzer.semantic_cache)
+        self.assertIsNone(cv_analyzer.CVAnalyzerAgent()._embed(CV_TEXT))
+
+    def test_hit_keeps_only_skills_and_experience(self):
+        agent = cv_analyzer.CVAnalyzerAgent()
+        cache = mock.Mock(**{"lookup.return_value": self.OTHER_RESULT})
+        with mock.patch.object(cv_analyzer, "semantic_cache", cache), \
+                mock.patch.object(agent, "_embed", return_value=[1.0]), \
+                mock.patch.object(cv_analyzer, "invoke_json") as invoke:
+            result = agent.analyze(CV_TEXT + "  ")
+        invoke.assert_not_called()
+        self.assertEqual(result, {
+            **agent._empty_result(),
+            "skills": self.OTHER_RESULT["skills"],
+            "experience": self.OTHER_RESULT["experience"]
+        })
+
+if __name__ == "__main__":
+    unittest.main()
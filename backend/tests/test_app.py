@@ -0,0 +1,115 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+import pymupdf
+
+# The app keeps its database and indexes in the working directory
+os.chdir(tempfile.mkdtemp())
+
+from fastapi.testclient import TestClient
+import app as app_module
+from database.db_manager import init_db, get_db_connection
+from agents.cv_analyzer import CVAnalyzerAgent
+from langchain_core.documents import Document
+
+def make_pdf(text: str) -> bytes:
+    """A one-page PDF containing the given text"""
+    document = pymupdf.open()
+    document.new_page().insert_text((72, 72), text)
+    try:
+        return document.tobytes()
+    finally:
+        document.close()
+
+class UploadCVsBatchTest(unittest.TestCase):
+    """/candidates/batch with the LLM and the vector store replaced"""
+
+    @classmethod
+    def setUpClass(cls):
+        init_db()
+        cls.client = TestClient(app_module.app)
+
+    def test_stores_email_from_contact(self):
+        cv_infos = [
+            {"name": "Ann Lee", "contact": {"email": "ann@example.com", "phone": ""}, "skills": ["Python"], "experience": [], "education": []},
+            {"name": "Bob Ray", "contact": {"email": "bob@example.com", "phone": ""}, "skills": None, "experience": None, "education": []}
+        ]
+
+        async def analyze_batch(self, cv_texts):
+            return cv_infos
+
+        files = [
+            ("files", ("ann.pdf", make_pdf("Ann Lee, Python developer"), "application/pdf")),
+            ("files", ("bob.pdf", make_pdf("Bob Ray, SQL analyst"), "application/pdf"))
+        ]
+        with mock.patch.object(CVAnalyzerAgent, "analyze_batch", analyze_batch), \
+                mock.patch.object(app_module, "add_cvs_to_vector_store") as add_cvs:
+            response = self.client.post("/candidates/batch", files=files)
+
+        self.assertEqual(response.status_code, 200)
+        candidates = response.json()
+        self.assertEqual([candidate["email"] for candidate in candidates], ["ann@example.com", "bob@example.com"])
+        add_cvs.assert_called_once()
+
+        rows = get_db_connection().execute(
+            "SELECT email, cv_text FROM candidates WHERE id IN (?, ?) ORDER BY name",
+            [candidate["candidate_id"] for candidate in candidates]
+        ).fetchall()
+        self.assertEqual([row[0] for row in rows], ["ann@example.com", "bob@example.com"])
+        self.assertIn("Python developer", rows[0][1])
+
+    def test_nameless_cv_uses_filename(self):
+        cv_infos = [
+            {"name": None, "contact": None, "skills": ["Python"], "experience": [], "education": []},
+            {"name": "Cy Park", "contact": {"email": "cy@example.com"}, "skills": [], "experience": [], "education": []}
+        ]
+
+        async def analyze_batch(self, cv_texts):
+            return cv_infos
+
+        files = [
+            ("files", ("dana_cv.pdf", make_pdf("Python developer"), "application/pdf")),
+            ("files", ("cy.pdf", make_pdf("Cy Park, designer"), "application/pdf"))
+        ]
+        with mock.patch.object(CVAnalyzerAgent, "analyze_batch", analyze_batch), \
+                mock.patch.object(app_module, "add_cvs_to_vector_store"):
+            response = self.client.post("/candidates/batch", files=files)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([candidate["name"] for candidate in response.json()], ["dana_cv", "Cy Park"])
+
+class MatchCVTest(unittest.TestCase):
+    """/matchcv with the vector store search replaced"""
+
+    @classmethod
+    def setUpClass(cls):
+        init_db()
+        cls.client = TestClient(app_module.app)
+        conn = get_db_connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO jobs (id, title, description, summary, skills, experience, qualifications) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ("job-1", "Data Engineer", "Python and SQL pipelines", "", '["Python"]', '{"minimum_years": 2}', "[]")
+            )
+            conn.execute(
+                "INSERT INTO candidates (id, name, email, cv_text, skills) VALUES (?, ?, ?, ?, ?)",
+                ("cand-1", "Ann Lee", "ann@example.com", "Python developer", '["Python"]')
+            )
+
+    def test_skips_candidates_missing_from_database(self):
+        # cand-deleted is still in the vector store but no longer in the candidates table
+        docs = [
+            Document(page_content="Python developer", metadata={"candidate_id": "cand-1", "candidate_name": "Ann Lee"}),
+            Document(page_content="SQL analyst", metadata={"candidate_id": "cand-deleted", "candidate_name": "Gone"})
+        ]
+        with mock.patch.object(app_module, "search_similar_cvs", return_value=docs):
+            response = self.client.post("/matchcv", params={"job_id": "job-1"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([candidate["candidate_id"] for candidate in response.json()], ["cand-1"])
+        rows = get_db_connection().execute("SELECT candidate_id FROM job_matches WHERE job_id = 'job-1'").fetchall()
+        self.assertEqual([row[0] for row in rows], ["cand-1"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from utils.faiss_store import FaissVectorStore
+
+class FaissStorePersistenceTest(unittest.TestCase):
+    """Loading an index saved by an earlier process"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = FaissVectorStore(persist_directory=self.tmp.name)
+        self.store.add(["a", "b"], ["text a", "text b"], np.eye(2, 4), [{"n": 0}, {"n": 1}])
+        self.store.save()
+
+    def test_round_trip(self):
+        loaded = FaissVectorStore(persist_directory=self.tmp.name)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual(loaded.search(np.eye(1, 4), k=1)[0][0].id, "a")
+
+    def test_half_written_documents_start_empty(self):
+        with open(os.path.join(self.tmp.name, FaissVectorStore.DOCUMENTS_FILE), "wb") as f:
+            f.write(b'{"next_id": 2, "docu')
+        loaded = FaissVectorStore(persist_directory=self.tmp.name)
+        self.assertEqual(len(loaded), 0)
+        self.assertEqual(loaded.search(np.eye(1, 4), k=1), [])
+
+    def test_missing_documents_start_empty(self):
+        os.remove(os.path.join(self.tmp.name, FaissVectorStore.DOCUMENTS_FILE))
+        self.assertEqual(len(FaissVectorStore(persist_directory=self.tmp.name)), 0)
+
+    def test_index_newer_than_documents(self):
+        # Crash between the index and documents renames: the index holds a vector the documents lack
+        documents_path = os.path.join(self.tmp.name, FaissVectorStore.DOCUMENTS_FILE)
+        with open(documents_path, "rb") as f:
+            old_documents = f.read()
+        self.store.add(["c"], ["text c"], np.eye(1, 4, 2), [{"n": 2}])
+        self.store.save()
+        with open(documents_path, "wb") as f:
+            f.write(old_documents)
+
+        loaded = FaissVectorStore(persist_directory=self.tmp.name)
+        self.assertEqual(len(loaded), 2)
+        self.assertEqual({doc.id for doc, _ in loaded.search(np.eye(1, 4, 2), k=3)}, {"a", "b"})
+        loaded.add(["d"], ["text d"], np.eye(1, 4, 3), [{"n": 3}])
+        self.assertEqual(loaded.search(np.eye(1, 4, 3), k=1)[0][0].id, "d")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from agents.matcher import MatcherAgent
+
+class RankNullFieldsTest(unittest.TestCase):
+    """Candidates whose analyzed CV has null skills or experience"""
+
+    def setUp(self):
+        self.matcher = MatcherAgent()
+        self.job = {
+            "skills": ["Python", "SQL"],
+            "experience": {"minimum_years": 2},
+            "qualifications": ["Bachelor's degree"]
+        }
+
+    def test_null_skills_and_experience(self):
+        candidate = {"skills": None, "experience": None, "education": None}
+        ranked = self.matcher.rank(self.job, [candidate])
+        self.assertEqual([score for _, score in ranked], [self.matcher.calculate_match(self.job, candidate)])
+        self.assertEqual(ranked[0][1], 0.25)
+        self.assertEqual(self.matcher.get_matching_skills(self.job, candidate), [])
+
+    def test_null_skills_among_others(self):
+        candidates = [
+            {"skills": ["python", "sql"], "experience": [{}, {}], "education": []},
+            {"skills": None, "experience": [{}], "education": []}
+        ]
+        scores = self.matcher.calculate_match_batch(self.job, candidates).tolist()
+        self.assertEqual(scores, [self.matcher.calculate_match(self.job, candidate) for candidate in candidates])
+
+    def test_null_job_skills(self):
+        job = {**self.job, "skills": None}
+        candidate = {"skills": ["python"], "experience": [{}, {}], "education": []}
+        ranked = self.matcher.rank(job, [candidate])
+        self.assertEqual([score for _, score in ranked], [self.matcher.calculate_match(job, candidate)])
+        self.assertEqual(self.matcher.get_matching_skills(job, candidate), [])
+
+class EducationLevelTest(unittest.TestCase):
+    """Degree names and abbreviations against a bachelor's requirement"""
+
+    DEGREES = {
+        "BSc Computer Science": "bachelor",
+        "MSc Computer Science": "master",
+        "MBA": "master",
+        "M.Sc. Data Science": "master",
+        "Ph.D. in Physics": "phd",
+        "Bachelor's in Economics": "bachelor",
+        "B.Eng Mechanical": "bachelor",
+        "Diploma in Marketing": "none"
+    }
+
+    def setUp(self):
+        self.matcher = MatcherAgent()
+
+    def test_degree_levels(self):
+        for degree, level in self.DEGREES.items():
+            with self.subTest(degree=degree):
+                score = self.matcher._calculate_education_match(["Bachelor's degree"], [{"degree": degree}])
+                self.assertEqual(score, 0.0 if level == "none" else 1.0)
+
+    def test_required_level(self):
+        for degree, level in self.DEGREES.items():
+            with self.subTest(degree=degree):
+                self.assertEqual(self.matcher._required_education_level([degree]), level)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+# The vector store keeps its index in the working directory
+os.chdir(tempfile.mkdtemp())
+
+from utils import vector_store
+
+def fake_embeddings(texts):
+    """One distinct 4-dimensional vector per text"""
+    return [[1.0, float(len(text)), 0.0, 0.5] for text in texts]
+
+class AddCVsTest(unittest.TestCase):
+    """add_cvs_to_vector_store with the embedding model replaced"""
+
+    def setUp(self):
+        for target, attribute, kwargs in (
+            (vector_store.document_embedding_model, "embed_documents", {"side_effect": fake_embeddings}),
+            (vector_store.vectorstore, "save", {}),
+            (vector_store, "SAVE_EVERY_CVS", {"new": 3})
+        ):
+            patcher = mock.patch.object(target, attribute, **kwargs)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        vector_store.save_vector_store()
+        vector_store.vectorstore.save.reset_mock()
+
+    def test_saves_every_few_cvs(self):
+        vector_store.add_cv_to_vector_store("c1", "Ann", "Python developer")
+        vector_store.add_cv_to_vector_store("c2", "Bob", "SQL analyst")
+        vector_store.vectorstore.save.assert_not_called()
+        vector_store.add_cvs_to_vector_store([("c3", "Cy", "Go engineer"), ("c4", "Di", "Data scientist")])
+        vector_store.vectorstore.save.assert_called_once()
+
+    def test_search_overlapping_an_add_is_not_cached(self):
+        vector_store.add_cv_to_vector_store("c1", "Ann", "Python developer")
+        search = vector_store.vectorstore.search
+
+        def search_during_add(vector, k):
+            results = search(vector, k)
+            vector_store.add_cv_to_vector_store("c2", "Bob", "Python engineer")
+            return results
+
+        embedding_model = mock.Mock(**{"embed_query.return_value": [1.0, 16.0, 0.0, 0.5]})
+        with mock.patch.object(vector_store, "embedding_model", embedding_model):
+            with mock.patch.object(vector_store.vectorstore, "search", side_effect=search_during_add):
+                vector_store.search_similar_cvs("Python developer", top_k=7)
+            query_cache = vector_store.query_caches[7]
+            self.assertIsNone(query_cache.lookup(query_cache.normalize([1.0, 16.0, 0.0, 0.5])))
+            ids = {doc.metadata["candidate_id"] for doc in vector_store.search_similar_cvs("Python developer", top_k=7)}
+        self.assertIn("c2", ids)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,90 @@
+import os
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+# SQLite file holding cached document embeddings
+EMBEDDING_CACHE_PATH = os.getenv("HIREFLOW_EMBEDDING_CACHE", ".hireflow_embeddings.db")
+
+# SQLite limits the number of parameters in one statement
+_MAX_LOOKUP = 500
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embedding model wrapper that stores document vectors on disk, keyed by a hash of the text.
+
+    Only texts never embedded before are sent to the wrapped model,
+    so re-uploaded CVs and repeated chunks skip the embedding call.
+    Query embeddings are not cached.
+    """
+
+    def __init__(self, embeddings: Embeddings, path: str = EMBEDDING_CACHE_PATH):
+        """
+        Args:
+            embeddings: Embedding model used for cache misses
+            path: SQLite file for the cache
+        """
+        self.embeddings = embeddings
+        # A single shared connection; access is serialized with a lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache (hash TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def make_key(self, text: str) -> str:
+        """Cache key of a text: a hash of the model name and the text"""
+        model = getattr(self.embeddings, "model", "")
+        return hashlib.blake2b(f"{model}\0{text}".encode("utf-8"), digest_size=16).hexdigest()
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given keys that exist"""
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _MAX_LOOKUP):
+                batch = keys[start:start + _MAX_LOOKUP]
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embedding_cache WHERE hash IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed documents, reusing cached vectors
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in order
+        """
+        keys = [self.make_key(text) for text in texts]
+        vectors = self._lookup(list(set(keys)))
+
+        # Embed every distinct missing text, all in one request
+        misses = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                misses.setdefault(key, text)
+        if misses:
+            new_vectors = self.embeddings.embed_documents(list(misses.values()))
+            vectors.update(zip(misses.keys(), new_vectors))
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO embedding_cache (hash, vector) VALUES (?, ?)",
+                    [(key, np.asarray(vectors[key], dtype=np.float32).tobytes()) for key in misses]
+                )
+                self._conn.commit()
+
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query with the wrapped model"""
+        return self.embeddings.embed_query(text)
@@ -0,0 +1,182 @@
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import faiss
+import numpy as np
+import orjson
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+class FaissVectorStore:
+    """
+    Exact cosine-similarity search over document vectors with a FAISS flat inner-product index.
+
+    Vectors are L2-normalized on insert and at query time, so inner product equals cosine similarity.
+    FAISS only stores vectors, so the documents are kept beside the index, keyed by the same int64 ids.
+
+    Once the index holds enough vectors to train on, it is converted to an 8-bit scalar quantizer,
+    which stores each dimension in one byte instead of four and scans 4x less memory per query.
+
+    Each file is written to a temporary name and renamed over the old one, so a crash mid-save
+    leaves the previous version in place rather than a truncated file.
+    """
+
+    INDEX_FILE = "index.faiss"
+    DOCUMENTS_FILE = "documents.json"
+
+    def __init__(self, persist_directory: Optional[str] = None, quantize_min_vectors: Optional[int] = 1000):
+        """
+        Args:
+            persist_directory: Directory the index is loaded from and saved to (None keeps it in memory only)
+            quantize_min_vectors: Vector count at which the index is trained and converted to int8 (None keeps float32)
+        """
+        self.persist_directory = persist_directory
+        self.quantize_min_vectors = quantize_min_vectors
+        self._index: Optional[faiss.IndexIDMap] = None
+        self._documents: Dict[int, Document] = {}
+        self._ids: Dict[str, int] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        if persist_directory and os.path.exists(os.path.join(persist_directory, self.INDEX_FILE)):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, ids: List[str], texts: List[str], embeddings: Any, metadatas: List[Dict[str, Any]]) -> None:
+        """
+        Add documents with precomputed embeddings, replacing any existing documents with the same ids
+
+        Args:
+            ids: Unique document ids
+            texts: Document texts
+            embeddings: One vector per text
+            metadatas: One metadata dict per text
+        """
+        if not ids:
+            return
+        vectors = np.ascontiguousarray(embeddings, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        with self._lock:
+            if self._index is None:
+                self._index = faiss.IndexIDMap(faiss.IndexFlatIP(vectors.shape[1]))
+
+            # Drop the earlier version of re-added documents
+            replaced = [self._ids.pop(doc_id) for doc_id in ids if doc_id in self._ids]
+            if replaced:
+                self._index.remove_ids(np.asarray(replaced, dtype=np.int64))
+                for int_id in replaced:
+                    del self._documents[int_id]
+
+            int_ids = np.arange(self._next_id, self._next_id + len(ids), dtype=np.int64)
+            self._next_id += len(ids)
+            self._index.add_with_ids(vectors, int_ids)
+            for doc_id, int_id, text, metadata in zip(ids, int_ids.tolist(), texts, metadatas):
+                self._ids[doc_id] = int_id
+                self._documents[int_id] = Document(page_content=text, metadata=metadata, id=doc_id)
+
+            if self._should_quantize():
+                self._quantize()
+
+    def _should_quantize(self) -> bool:
+        """True if the index is still float32 and has enough vectors to train the quantizer"""
+        return (
+            self.quantize_min_vectors is not None
+            and self._index.ntotal >= self.quantize_min_vectors
+            and isinstance(faiss.downcast_index(self._index.index), faiss.IndexFlat)
+        )
+
+    def _quantize(self) -> None:
+        """Replace the float32 index with an 8-bit scalar quantizer trained on the vectors it holds"""
+        flat_index = faiss.downcast_index(self._index.index)
+        vectors = flat_index.reconstruct_n(0, flat_index.ntotal)
+        int_ids = faiss.vector_to_array(self._index.id_map)
+
+        # Per-dimension value ranges are learned from the stored vectors; query vectors stay float32
+        quantized_index = faiss.IndexScalarQuantizer(vectors.shape[1], faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        quantized_index.train(vectors)
+        self._index = faiss.IndexIDMap(quantized_index)
+        self._index.add_with_ids(vectors, int_ids)
+
+    def search(self, vector: np.ndarray, k: int) -> List[Tuple[Document, float]]:
+        """
+        Find the documents most similar to a query vector
+
+        Args:
+            vector: Query embedding
+            k: Number of results
+
+        Returns:
+            List of (document, cosine similarity), most similar first
+        """
+        query = np.ascontiguousarray(np.asarray(vector, dtype=np.float32).reshape(1, -1))
+        faiss.normalize_L2(query)
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return []
+            scores, int_ids = self._index.search(query, min(k, self._index.ntotal))
+            return [
+                (self._documents[int_id], float(score))
+                for score, int_id in zip(scores[0].tolist(), int_ids[0].tolist())
+                if int_id != -1
+            ]
+
+    def save(self) -> None:
+        """Write the index and documents to the persist directory"""
+        if not self.persist_directory:
+            return
+        
+        # Only the in-memory snapshot is taken under the store lock, so searches are not blocked by the disk writes
+        with self._save_lock:
+            with self._lock:
+                if self._index is None:
+                    return
+                index_bytes = faiss.serialize_index(self._index)
+                documents = list(self._documents.items())
+                next_id = self._next_id
+            
+            os.makedirs(self.persist_directory, exist_ok=True)
+            index_path = os.path.join(self.persist_directory, self.INDEX_FILE)
+            with open(index_path + ".tmp", "wb") as f:
+                f.write(index_bytes.tobytes())
+            os.replace(index_path + ".tmp", index_path)
+            
+            documents = [
+                {"int_id": int_id, "id": doc.id, "text": doc.page_content, "metadata": doc.metadata}
+                for int_id, doc in documents
+            ]
+            documents_path = os.path.join(self.persist_directory, self.DOCUMENTS_FILE)
+            with open(documents_path + ".tmp", "wb") as f:
+                f.write(orjson.dumps({"next_id": next_id, "documents": documents}))
+            os.replace(documents_path + ".tmp", documents_path)
+
+    def _load(self) -> None:
+        """Read the index and documents written by save(), starting empty if either is missing or unreadable"""
+        try:
+            index = faiss.read_index(os.path.join(self.persist_directory, self.INDEX_FILE))
+            with open(os.path.join(self.persist_directory, self.DOCUMENTS_FILE), "rb") as f:
+                data = orjson.loads(f.read())
+            documents = {
+                item["int_id"]: Document(page_content=item["text"], metadata=item["metadata"], id=item["id"])
+                for item in data["documents"]
+            }
+            next_id = data["next_id"]
+        except (OSError, RuntimeError, orjson.JSONDecodeError, KeyError, TypeError) as e:
+            logger.warning("Could not load the vector index from %s, starting empty: %s", self.persist_directory, e)
+            return
+
+        # A crash between the two renames in save() leaves one file a version behind the other;
+        # keep only the documents present in both
+        index_ids = faiss.vector_to_array(index.id_map)
+        orphans = index_ids[~np.isin(index_ids, list(documents))]
+        if len(orphans):
+            index.remove_ids(orphans)
+        indexed = set(index_ids.tolist())
+
+        self._index = index
+        self._documents = {int_id: doc for int_id, doc in documents.items() if int_id in indexed}
+        self._ids = {doc.id: int_id for int_id, doc in self._documents.items()}
+        self._next_id = max([next_id, *(int_id + 1 for int_id in indexed)])
@@ -0,0 +1,37 @@
+import sys
+from typing import Any, Dict, Iterable
+
+def intern_fields(result: Dict[str, Any], list_fields: Iterable[str] = (), item_fields: Dict[str, Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Intern the short strings that repeat across many parsed results (skills,
+    degrees, companies), so each distinct value is stored only once in memory
+
+    Args:
+        result: Parsed agent output, modified in place
+        list_fields: Keys holding lists of strings, e.g. "skills"
+        item_fields: Keys holding lists of dicts, mapped to the string keys to intern in each dict
+
+    Returns:
+        The same result dict
+    """
+    if not isinstance(result, dict):
+        return result
+
+    for field in list_fields:
+        values = result.get(field)
+        if isinstance(values, list):
+            result[field] = [sys.intern(value) if isinstance(value, str) else value for value in values]
+
+    for field, keys in (item_fields or {}).items():
+        items = result.get(field)
+        if not isinstance(items, list):
+            continue
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            for key in keys:
+                value = item.get(key)
+                if isinstance(value, str):
+                    item[key] = sys.intern(value)
+
+    return result
@@ -1,31 +1,122 @@
-import io
-from typing import Optional
+import os
+import mmap
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Optional, Union
 from fastapi import UploadFile
-import PyPDF2
+from fastapi.concurrency import run_in_threadpool
+import pymupdf
+
+# Starlette keeps uploads up to this size in memory and spools larger ones to a temporary file
+SPOOL_MAX_SIZE = 1024 * 1024
+
+# Larger uploads are rejected instead of being parsed
+MAX_PDF_SIZE = int(os.getenv("HIREFLOW_MAX_PDF_SIZE", 20 * 1024 * 1024))
+
+# Documents with at least this many pages have their pages extracted in parallel
+PARALLEL_MIN_PAGES = int(os.getenv("HIREFLOW_PDF_PARALLEL_MIN_PAGES", 16))
+
+# Worker processes for parallel extraction
+PDF_WORKERS = min(8, os.cpu_count() or 1)
+
+# Created on first use; MuPDF is not thread-safe, so pages are split across processes, not threads
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Parsing runs in threadpool threads; this keeps two of them from using MuPDF at the same time
+_mupdf_lock = threading.Lock()
 
 async def extract_text_from_pdf(file: UploadFile) -> str:
     """
     Extract text content from a PDF file
-    
+
     Args:
         file: Uploaded PDF file
-        
+
     Returns:
         str: Extracted text content
     """
-    # Read the uploaded file into memory
-    content = await file.read()
-    
-    # Create a PDF reader object
-    pdf_reader = PyPDF2.PdfReader(io.BytesIO(content))
-    
-    # Extract text from all pages
-    text_content = ""
-    for page_num in range(len(pdf_reader.pages)):
-        page = pdf_reader.pages[page_num]
-        text_content += page.extract_text() + "\n\n"
-    
+    if file.size is not None and file.size > MAX_PDF_SIZE:
+        raise ValueError(f"PDF is larger than {MAX_PDF_SIZE} bytes")
+
+    # Parsing is CPU-bound, so run it in a worker thread to keep the event loop free
+    if file.size is None or file.size <= SPOOL_MAX_SIZE:
+        # Small upload, already in memory
+        content = await file.read()
+        text_content = await run_in_threadpool(parse_pdf_bytes, content)
+    else:
+        # Large upload, already on disk: map the temporary file instead of reading it into memory
+        text_content = await run_in_threadpool(parse_pdf_file, file.file)
+
     # Rewind the file so it can be read again if needed
     await file.seek(0)
-    
-    return text_content
\ No newline at end of file
+
+    return text_content
+
+def parse_pdf_file(pdf_file: BinaryIO) -> str:
+    """
+    Extract text content from an open PDF file without copying it into memory
+
+    Args:
+        pdf_file: Binary file object backed by a real file
+
+    Returns:
+        str: Extracted text content
+    """
+    pdf_file.flush()
+    with mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        with memoryview(mapped) as content:
+            return parse_pdf_bytes(content)
+
+def parse_pdf_bytes(content: Union[bytes, memoryview]) -> str:
+    """
+    Extract text content from PDF bytes
+
+    Args:
+        content: Raw PDF file content
+
+    Returns:
+        str: Extracted text content
+    """
+    # Open the PDF from memory; MuPDF does the parsing in C
+    with _mupdf_lock:
+        pdf_document = pymupdf.open(stream=content, filetype="pdf")
+        try:
+            page_count = pdf_document.page_count
+            if page_count < PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+                # Extract plain text from all pages
+                return "".join(page.get_text("text") + "\n\n" for page in pdf_document)
+        finally:
+            pdf_document.close()
+
+    # Long document: written once to a temporary file that each worker opens to extract a contiguous
+    # range of pages, so the PDF is not pickled into every worker process
+    bounds = [page_count * i // PDF_WORKERS for i in range(PDF_WORKERS + 1)]
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as pdf_file:
+        pdf_file.write(content)
+    try:
+        parts = _get_process_pool().map(
+            _extract_page_range,
+            [pdf_file.name] * PDF_WORKERS,
+            bounds[:-1],
+            bounds[1:]
+        )
+        return "".join(parts)
+    finally:
+        os.remove(pdf_file.name)
+
+def _extract_page_range(path: str, start: int, stop: int) -> str:
+    """Extract the text of pages [start, stop) of the PDF at path, formatted like parse_pdf_bytes"""
+    pdf_document = pymupdf.open(path, filetype="pdf")
+    try:
+        return "".join(pdf_document[i].get_text("text") + "\n\n" for i in range(start, stop))
+    finally:
+        pdf_document.close()
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """The shared worker pool, started with "spawn" since forking the threaded server is unsafe"""
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
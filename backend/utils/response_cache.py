@@ -0,0 +1,66 @@
+import os
+import orjson
+import time
+import hashlib
+import sqlite3
+import threading
+from typing import Any, Optional
+
+# SQLite file holding cached LLM responses
+CACHE_PATH = os.getenv("HIREFLOW_LLM_CACHE", ".hireflow_llm.db")
+
+# Cached responses expire after one day
+CACHE_TTL = 86400
+
+# A single shared connection; writes are serialized with a lock
+_lock = threading.Lock()
+_conn = sqlite3.connect(CACHE_PATH, check_same_thread=False)
+_conn.execute(
+    "CREATE TABLE IF NOT EXISTS llm_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+)
+_conn.commit()
+
+def make_cache_key(prompt: str) -> str:
+    """
+    Build a cache key from a fully rendered prompt
+
+    Args:
+        prompt: Prompt text exactly as it would be sent to the LLM
+
+    Returns:
+        str: SHA-256 hex digest of the prompt
+    """
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+def get_cached(key: str) -> Optional[Any]:
+    """
+    Look up a cached response
+
+    Args:
+        key: Key returned by make_cache_key
+
+    Returns:
+        The cached value, or None if missing or expired
+    """
+    with _lock:
+        row = _conn.execute(
+            "SELECT value FROM llm_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+    return orjson.loads(row[0]) if row else None
+
+def set_cached(key: str, value: Any, expire: int = CACHE_TTL) -> None:
+    """
+    Store a response in the cache
+
+    Args:
+        key: Key returned by make_cache_key
+        value: JSON-serializable value (parsed agent output)
+        expire: Time to live in seconds
+    """
+    with _lock:
+        _conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, orjson.dumps(value).decode(), time.time() + expire)
+        )
+        _conn.commit()
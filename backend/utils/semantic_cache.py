@@ -0,0 +1,81 @@
+import copy
+import threading
+from typing import Any, List, Optional
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+class SemanticCache:
+    """
+    Reuse results computed for near-duplicate texts.
+
+    Texts are embedded with the given embedding model and L2-normalized,
+    so a single inner product against the stored vectors gives cosine similarity.
+    Entries are kept in a fixed-size ring buffer, evicting the oldest first.
+    """
+
+    def __init__(self, embeddings: Embeddings, threshold: float, max_entries: int = 2048):
+        """
+        Args:
+            embeddings: Embedding model used by embed() and embed_many()
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached results
+        """
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._vectors: Optional[np.ndarray] = None
+        self._values: List[Any] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embed a single text as a normalized float32 vector"""
+        return self.normalize(self.embeddings.embed_query(text))
+
+    def embed_many(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts in one request, one normalized row per text"""
+        return self.normalize(self.embeddings.embed_documents(texts))
+
+    def lookup(self, vector: np.ndarray) -> Optional[Any]:
+        """
+        Find the cached result closest to a vector
+
+        Args:
+            vector: Normalized embedding from embed()
+
+        Returns:
+            A copy of the cached result if its similarity reaches the threshold, else None
+        """
+        with self._lock:
+            if self._size == 0:
+                return None
+            similarities = self._vectors[:self._size] @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            return copy.deepcopy(self._values[best])
+
+    def add(self, vector: np.ndarray, value: Any) -> None:
+        """Store a result under its embedding"""
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_entries, vector.shape[-1]), dtype=np.float32)
+            self._vectors[self._next] = vector
+            self._values[self._next] = copy.deepcopy(value)
+            self._next = (self._next + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        """Drop all cached results, e.g. when the data they were computed from changes"""
+        with self._lock:
+            self._values = [None] * self.max_entries
+            self._size = 0
+            self._next = 0
+    
+    @staticmethod
+    def normalize(embeddings: Any) -> np.ndarray:
+        """Convert embeddings already computed elsewhere into normalized float32 vectors"""
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
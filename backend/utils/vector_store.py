@@ -1,21 +1,48 @@
 import os
-from typing import List, Dict, Any
-from langchain_chroma import Chroma
+import logging
+import threading
+from typing import List, Dict, Any, Tuple
 from langchain_ollama import OllamaEmbeddings
 from langchain.text_splitter import RecursiveCharacterTextSplitter
+from utils.semantic_cache import SemanticCache
+from utils.embedding_cache import CachedEmbeddings
+from utils.faiss_store import FaissVectorStore
+
+logger = logging.getLogger(__name__)
 
 # Initialize the embedding model
 embedding_model = OllamaEmbeddings(model="nomic-embed-text:latest")
 
+# CV chunks already embedded once are not sent to the embedding model again
+document_embedding_model = CachedEmbeddings(embedding_model)
+
 # Directory for persistent storage
-PERSIST_DIR = "./chroma_db"
+PERSIST_DIR = "./faiss_db"
 
-# Initialize Chroma vector store with embedding function
-vectorstore = Chroma(
-    collection_name="cv_collection",
-    embedding_function=embedding_model,
-    persist_directory=PERSIST_DIR
-)
+# Exact cosine-similarity index over CV chunks, loaded from disk if saved before
+vectorstore = FaissVectorStore(persist_directory=PERSIST_DIR)
+
+# The index is written to disk once this many CVs have been added since the last save, and on shutdown
+SAVE_EVERY_CVS = int(os.getenv("HIREFLOW_INDEX_SAVE_EVERY", 25))
+
+# CVs added since the index was last written
+_unsaved_cvs = 0
+_unsaved_lock = threading.Lock()
+
+# Cosine similarity above which two job descriptions share search results
+QUERY_SIMILARITY_THRESHOLD = float(os.getenv("HIREFLOW_QUERY_SIMILARITY_THRESHOLD", 0.95))
+
+# Minimum cosine similarity for a CV chunk to be returned by a search
+# (the 0.3 relevance score the earlier Chroma L2 search used corresponds to about 0.5)
+SEARCH_SCORE_THRESHOLD = 0.5
+
+# Search results for recent queries, one cache per top_k
+query_caches: Dict[int, SemanticCache] = {}
+
+# Incremented with every add; a search only caches its results if no CVs were added while it ran.
+# The lock makes that check and the insert atomic with respect to the clear after an add.
+_index_generation = 0
+_query_cache_lock = threading.Lock()
 
 # Text splitter for long documents
 text_splitter = RecursiveCharacterTextSplitter(
@@ -31,21 +58,70 @@ def add_cv_to_vector_store(candidate_id: str,candidate_name: str , cv_text: str)
         candidate_id: Unique identifier for the candidate
         cv_text: Text content of the CV
     """
-    # Split text into chunks
-    texts = text_splitter.split_text(cv_text)
+    add_cvs_to_vector_store([(candidate_id, candidate_name, cv_text)])
+
+def add_cvs_to_vector_store(cvs: List[Tuple[str, str, str]]) -> None:
+    """
+    Add several CVs to the vector store, embedding all their chunks in one request
     
-    # Generate chunk IDs
-    chunk_ids = [f"{candidate_id}_chunk_{i}" for i in range(len(texts))]
+    Args:
+        cvs: List of (candidate_id, candidate_name, cv_text)
+    """
+    texts, chunk_ids, metadatas = [], [], []
+    for candidate_id, candidate_name, cv_text in cvs:
+        # Split text into chunks
+        chunks = text_splitter.split_text(cv_text)
+        texts.extend(chunks)
+        
+        # Generate chunk IDs
+        chunk_ids.extend(f"{candidate_id}_chunk_{i}" for i in range(len(chunks)))
+        
+        # Metadata for each chunk
+        metadatas.extend({"candidate_id": candidate_id, "candidate_name": candidate_name, "chunk_index": i} for i in range(len(chunks)))
+    
+    # A single embed_documents call sends every chunk to Ollama in one HTTP request
+    embeddings = document_embedding_model.embed_documents(texts)
+    vectorstore.add(chunk_ids, texts, embeddings, metadatas)
     
-    # Metadata for each chunk
-    metadatas = [{"candidate_id": candidate_id, "candidate_name": candidate_name, "chunk_index": i} for i in range(len(texts))]
+    # Earlier search results do not include these CVs
+    global _index_generation
+    with _query_cache_lock:
+        _index_generation += 1
+        for query_cache in query_caches.values():
+            query_cache.clear()
     
-    # Add to vector store
-    vectorstore.add_texts(
-        texts=texts,
-        metadatas=metadatas,
-        ids=chunk_ids
-    )
+    # Each save rewrites the whole index, so it is only written every SAVE_EVERY_CVS CVs
+    global _unsaved_cvs
+    with _unsaved_lock:
+        _unsaved_cvs += len(cvs)
+        save = _unsaved_cvs >= SAVE_EVERY_CVS
+    if save:
+        save_vector_store()
+
+def save_vector_store() -> None:
+    """Persist the CV index to disk"""
+    global _unsaved_cvs
+    with _unsaved_lock:
+        _unsaved_cvs = 0
+    vectorstore.save()
+
+def reindex_candidates(batch_size: int = 32) -> int:
+    """
+    Rebuild the CV index from the CV texts stored in the database
+    
+    Args:
+        batch_size: Number of CVs embedded per request
+        
+    Returns:
+        int: Number of CVs indexed
+    """
+    from database.db_manager import get_db_connection
+    
+    rows = get_db_connection().execute("SELECT id, name, cv_text FROM candidates").fetchall()
+    for start in range(0, len(rows), batch_size):
+        add_cvs_to_vector_store([tuple(row) for row in rows[start:start + batch_size]])
+    save_vector_store()
+    return len(rows)
 
 def search_similar_cvs(job_description: str, top_k: int = 5) -> List[Dict[str, Any]]:
     """
@@ -58,16 +134,29 @@ def search_similar_cvs(job_description: str, top_k: int = 5) -> List[Dict[str, A
     Returns:
         List of document objects with metadata
     """
-    # Perform similarity search with the retriever
-    retriever = vectorstore.as_retriever(
-        search_type="similarity_score_threshold", 
-        search_kwargs={"score_threshold": 0.3, "k": top_k}
-    )
+    # Embed the query once, for both the cache lookup and the search
+    embedding = embedding_model.embed_query(job_description)
+    
+    # Near-identical job descriptions reuse the earlier results
+    query_cache = query_caches.get(top_k)
+    if query_cache is None:
+        query_cache = query_caches.setdefault(top_k, SemanticCache(embedding_model, threshold=QUERY_SIMILARITY_THRESHOLD))
+    vector = query_cache.normalize(embedding)
+    cached_results = query_cache.lookup(vector)
+    if cached_results is not None:
+        return cached_results
     
-    # Get the documents
-    results = retriever.invoke(job_description)
-    print(f"Found {len(results)} similar CVs.")
-    print(f"Results: {results}")
+    generation = _index_generation
+    results = [
+        doc
+        for doc, score in vectorstore.search(vector, k=top_k)
+        if score >= SEARCH_SCORE_THRESHOLD
+    ]
+    with _query_cache_lock:
+        if generation == _index_generation:
+            query_cache.add(vector, results)
+    logger.info("Found %d similar CVs.", len(results))
+    logger.debug("Results: %s", results)
     return results
     # Aggregate scores per candidate
     # candidate_scores = {}
@@ -99,4 +188,8 @@ def search_similar_cvs(job_description: str, top_k: int = 5) -> List[Dict[str, A
     # candidates.sort(key=lambda x: x["match_score"], reverse=True)
 
     # Limit to top_k candidates
-    # return candidates[:top_k]
\ No newline at end of file
+    # return candidates[:top_k]
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    logger.info("Indexed %d CVs.", reindex_candidates())
\ No newline at end of file
@@ -1,16 +1,25 @@
 import streamlit as st
+import asyncio
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import json
-import matplotlib.pyplot as plt
-import time
-from datetime import datetime
+from datetime import datetime, date
 import os
-import io
 
 # Constants
 API_URL = "http://localhost:8000"  # Update if your FastAPI backend is running elsewhere
 
+# Maximum number of job uploads in flight at once during a CSV import
+MAX_CONCURRENT_UPLOADS = 8
+
+# Rows parsed at a time during a CSV import, so memory stays bounded for large files
+CSV_CHUNK_SIZE = 1000
+
+# Candidates shown individually in the match score chart; the rest are shown as one averaged bar
+MAX_CHART_BARS = 20
+
 # Set page configuration
 st.set_page_config(
     page_title="HireFlow - AI Recruitment System",
@@ -20,45 +29,102 @@ st.set_page_config(
 )
 
 # Helper functions
+@st.cache_resource
+def get_session():
+    """HTTP session shared by all reruns and browser sessions, so connections to the API are kept alive and reused"""
+    session = requests.Session()
+    session.mount(API_URL, HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return session
+
 def upload_job_description(title, description):
     """Upload a job description to the API"""
-    response = requests.post(
+    response = get_session().post(
         f"{API_URL}/jobs",
         json={"title": title, "description": description}
     )
     return response.json() if response.status_code == 200 else None
 
+async def import_jobs(jobs, on_progress):
+    """
+    Upload several jobs to the API concurrently
+    
+    Args:
+        jobs: List of (title, description)
+        on_progress: Called with the number of finished uploads after each one
+    
+    Returns:
+        Number of jobs uploaded successfully
+    """
+    # The semaphore limits load on the API instead of sleeping between requests
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+    
+    async with httpx.AsyncClient(base_url=API_URL, timeout=30) as client:
+        async def upload(title, description):
+            async with semaphore:
+                response = await client.post("/jobs", json={"title": title, "description": description})
+                return response.status_code == 200
+        
+        uploaded = 0
+        for done, upload_task in enumerate(asyncio.as_completed([upload(title, description) for title, description in jobs]), start=1):
+            uploaded += await upload_task
+            on_progress(done)
+    
+    return uploaded
+
 def upload_candidate_cv(file, name, email):
     """Upload a candidate CV to the API"""
     files = {"file": (file.name, file, "application/pdf")}
     data = {"candidate_name": name, "candidate_email": email}
-    response = requests.post(f"{API_URL}/candidates", files=files, data=data)
+    # CV analysis can take a while, so there is no timeout
+    response = get_session().post(f"{API_URL}/candidates", files=files, data=data)
     return response.json() if response.status_code == 200 else None
 
+# Streamlit reruns the whole script on every interaction, so listings are cached briefly;
+# call .clear() on these functions after changing the data they return
+@st.cache_data(ttl=30, show_spinner=False)
 def get_jobs():
     """Get all jobs from the API"""
-    response = requests.get(f"{API_URL}/jobs")
+    response = get_session().get(f"{API_URL}/jobs")
     return response.json() if response.status_code == 200 else []
 
+@st.cache_data(ttl=30, show_spinner=False)
 def get_candidates():
     """Get all candidates from the API"""
-    response = requests.get(f"{API_URL}/candidates")
+    response = get_session().get(f"{API_URL}/candidates")
     return response.json() if response.status_code == 200 else []
 
-def match_candidates(job_id, threshold=0.3):
-    """Match candidates to a job using RAG"""
-    response = requests.post(
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_matches(job_id, threshold):
+    """Matches for a job, cached per (job_id, threshold); raises on error so failures are not cached"""
+    response = get_session().post(
         f"{API_URL}/matchcv", 
         params={"job_id": job_id, "threshold": threshold}
     )
     
-    if response.status_code == 200:
-        # The response now contains Document objects with metadata
-        return response.json()
-    else:
-        st.error(f"Error matching candidates: {response.text}")
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    
+    # The response now contains Document objects with metadata
+    return response.json()
+
+def match_candidates(job_id, threshold=0.3):
+    """Match candidates to a job using RAG"""
+    try:
+        return fetch_matches(job_id, threshold)
+    except RuntimeError as e:
+        st.error(f"Error matching candidates: {e}")
         return []
 
+@st.cache_data(ttl=120, show_spinner=False)
+def get_match_counts(threshold=0.3):
+    """Get the number of matching candidates for every job in one request; raises on error so failures are not cached"""
+    response = get_session().get(f"{API_URL}/jobs/match-counts", params={"threshold": threshold})
+    
+    if response.status_code != 200:
+        raise RuntimeError(response.text)
+    
+    return response.json()
+
 def send_interview_request(candidate_id, job_id, proposed_dates, interview_format):
     """Send an interview request"""
     data = {
@@ -67,28 +133,98 @@ def send_interview_request(candidate_id, job_id, proposed_dates, interview_forma
         "proposed_dates": proposed_dates,
         "interview_format": interview_format
     }
-    response = requests.post(f"{API_URL}/interview-requests", json=data)
+    response = get_session().post(f"{API_URL}/interview-requests", json=data)
     return response.json() if response.status_code == 200 else None
 
+def match_score_chart_data(names, scores):
+    """
+    Data for the match score bar chart
+    
+    Args:
+        names: Candidate names, highest score first
+        scores: Match score of each candidate
+    
+    Returns:
+        DataFrame with one row per bar, in display order
+    """
+    # Past a few dozen bars the labels are unreadable, so the rest are shown as one averaged bar
+    if len(names) > MAX_CHART_BARS:
+        tail_scores = scores[MAX_CHART_BARS:]
+        names = names[:MAX_CHART_BARS] + [f"+{len(tail_scores)} more"]
+        scores = scores[:MAX_CHART_BARS] + [sum(tail_scores) / len(tail_scores)]
+    
+    return pd.DataFrame({"Candidate": names, "Match Score": scores})
+
+@st.cache_data(max_entries=1, show_spinner=False)
+def next_business_days(today, n=5):
+    """The n business days (Monday to Friday) after today, cached until the date changes"""
+    return pd.bdate_range(start=pd.Timestamp(today) + pd.Timedelta(days=1), periods=n).strftime("%Y-%m-%d").tolist()
+
+@st.fragment
+def show_match_details(match, job_id):
+    """
+    Show one matched candidate in an expander with its actions
+    
+    As a fragment, clicking a button here reruns only this candidate's section, not the whole page
+    
+    Args:
+        match: Match returned by the API
+        job_id: Job the candidate was matched to
+    """
+    # Read each field once
+    name = match.get("name", "Unknown")
+    score = match.get("match_score", 0)
+    matching_skills = match.get("matching_skills")
+    email = match.get("email", "N/A")
+    candidate_id = match.get("candidate_id")
+    
+    with st.expander(f"{name} - {score:.2f} match"):
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.subheader("Matching Skills")
+            if matching_skills:
+                for skill in matching_skills:
+                    st.markdown(f"- {skill}")
+            else:
+                st.markdown("No specific skills extracted")
+            
+            if st.button("View Full Resume", key=f"view_{candidate_id}"):
+                st.info("Resume view functionality to be implemented")
+        
+        with col2:
+            # Additional candidate information could be displayed here
+            st.subheader("Contact")
+            st.markdown(f"**Email:** {email}")
+            
+            # If there's a CV document link, add it here
+            if "cv_document" in match:
+                st.markdown(f"**CV Document:** [View]({match['cv_document']})")
+            
+            if st.button("Schedule Interview", key=f"interview_{candidate_id}"):
+                st.session_state.interview_job_id = job_id
+                st.session_state.interview_candidate_id = candidate_id
+                st.session_state.page = "Interview Requests"
+                # Switching pages needs a full rerun, not just this fragment
+                st.rerun(scope="app")
+
+# Shared by all sessions for a few seconds, so new sessions do not each wait on the check
+@st.cache_data(ttl=10, show_spinner=False)
 def api_health_check():
     """Check if the API is running"""
     try:
-        response = requests.get(f"{API_URL}/jobs", timeout=2)
+        # Liveness endpoint that touches neither the database nor the LLM
+        response = get_session().get(f"{API_URL}/health", timeout=1)
         return response.status_code == 200
     except requests.exceptions.RequestException:
         return False
 
-# Initialize session state
-if 'api_connected' not in st.session_state:
+# Initialize session state; the API is only checked the first time
+for key, default in (("api_connected", None), ("jobs", []), ("candidates", []),
+                     ("current_matches", []), ("page", "Dashboard")):
+    st.session_state.setdefault(key, default)
+if st.session_state.api_connected is None:
     st.session_state.api_connected = api_health_check()
-if 'jobs' not in st.session_state:
-    st.session_state.jobs = []
-if 'candidates' not in st.session_state:
-    st.session_state.candidates = []
-if 'current_matches' not in st.session_state:
-    st.session_state.current_matches = []
-if 'page' not in st.session_state:
-    st.session_state.page = "Dashboard"
 
 # Sidebar for navigation
 st.sidebar.title("HireFlow 👔")
@@ -100,8 +236,13 @@ st.sidebar.info(f"API Status: {api_status}")
 
 # Refresh data button
 if st.sidebar.button("↻ Refresh Data"):
+    api_health_check.clear()
     st.session_state.api_connected = api_health_check()
     if st.session_state.api_connected:
+        get_jobs.clear()
+        get_candidates.clear()
+        fetch_matches.clear()
+        get_match_counts.clear()
         st.session_state.jobs = get_jobs()
         st.session_state.candidates = get_candidates()
         st.toast("Data refreshed successfully!", icon="✅")
@@ -133,12 +274,23 @@ if page == "Dashboard":
         # Placeholder for a chart
         if len(st.session_state.jobs) > 0 and len(st.session_state.candidates) > 0:
             st.subheader("Candidates per Job")
-            fig, ax = plt.subplots()
-            match_counts = [len(match_candidates(job["id"])) for job in st.session_state.jobs]
-            ax.bar([job["title"] for job in st.session_state.jobs], match_counts)
-            ax.set_xticklabels([job["title"] for job in st.session_state.jobs], rotation=45, ha='right')
-            ax.set_ylabel("Candidate Matches")
-            st.pyplot(fig)
+            
+            # Matching every job is expensive, so only do it on request instead of on every rerun
+            if st.button("Load Match Counts"):
+                with st.spinner("Matching candidates..."):
+                    try:
+                        st.session_state.match_counts = get_match_counts()
+                    except RuntimeError as e:
+                        st.error(f"Error loading match counts: {e}")
+            
+            if 'match_counts' in st.session_state:
+                match_counts = [st.session_state.match_counts.get(job["id"], 0) for job in st.session_state.jobs]
+                st.bar_chart(
+                    pd.DataFrame({"Job": [job["title"] for job in st.session_state.jobs], "Candidate Matches": match_counts}),
+                    x="Job",
+                    y="Candidate Matches",
+                    sort=False
+                )
         else:
             st.info("Add jobs and candidates to see analytics")
     
@@ -162,10 +314,11 @@ if page == "Dashboard":
     
     st.subheader("Recent Activities")
     # In a real app, you would fetch actual activity data
-    st.table(pd.DataFrame({
-        "Time": [datetime.now().strftime("%H:%M:%S")],
+    # The time the session started, not the time of the current rerun
+    st.table({
+        "Time": [st.session_state.setdefault("started_at", datetime.now().strftime("%H:%M:%S"))],
         "Activity": ["System initialized"]
-    }))
+    })
 
 # Jobs page
 elif page == "Jobs":
@@ -183,21 +336,31 @@ elif page == "Jobs":
         if not st.session_state.jobs:
             st.info("No jobs found. Add a new job to get started.")
         else:
-            for job in st.session_state.jobs:
-                with st.expander(f"{job['title']}"):
-                    st.write(f"**Job ID:** {job['id']}")
-                    st.write(f"**Summary:** {job['summary']}")
-                    
-                    # Actions
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button("Match Candidates", key=f"match_{job['id']}"):
-                            st.session_state.current_job_id = job['id']
-                            st.session_state.page = "Matching"
-                            st.rerun()
-                    with col2:
-                        if st.button("Delete", key=f"delete_{job['id']}"):
-                            st.error("Delete functionality not implemented yet")
+            # One table widget for all jobs instead of an expander and buttons per job
+            jobs_df = pd.DataFrame(st.session_state.jobs, columns=["title", "id", "summary"]).assign(action=None)
+            st.data_editor(
+                jobs_df,
+                column_config={
+                    "title": "Title",
+                    "id": "Job ID",
+                    "summary": "Summary",
+                    "action": st.column_config.SelectboxColumn("Action", options=["Match Candidates", "Delete"])
+                },
+                disabled=["title", "id", "summary"],
+                hide_index=True,
+                key="jobs_editor"
+            )
+            
+            # Actions chosen in the table
+            for row, changes in st.session_state.jobs_editor["edited_rows"].items():
+                if changes.get("action") == "Match Candidates":
+                    st.session_state.current_job_id = jobs_df["id"][row]
+                    st.session_state.page = "Matching"
+                    # The table keeps its edits across reruns; reset it so the action only runs once
+                    del st.session_state.jobs_editor
+                    st.rerun()
+                elif changes.get("action") == "Delete":
+                    st.error("Delete functionality not implemented yet")
     
     # Add job
     with job_tab2:
@@ -214,6 +377,8 @@ elif page == "Jobs":
                 if result:
                     st.success(f"Job '{job_title}' added successfully!")
                     # Refresh jobs list
+                    get_jobs.clear()
+                    get_match_counts.clear()
                     st.session_state.jobs = get_jobs()
                 else:
                     st.error("Failed to add job. Please check the API connection.")
@@ -228,29 +393,42 @@ elif page == "Jobs":
         uploaded_file = st.file_uploader("Upload a CSV file with job data", type="csv")
         
         if uploaded_file is not None:
-            # Read CSV
+            # Read only the first rows for the preview
             try:
-                df = pd.read_csv(uploaded_file, encoding='ISO-8859-1')
-                st.dataframe(df.head())
+                preview = pd.read_csv(uploaded_file, encoding='ISO-8859-1', nrows=5)
+                st.dataframe(preview)
                 
-                if "Job Title" in df.columns and "Job Description" in df.columns:
+                if "Job Title" in preview.columns and "Job Description" in preview.columns:
                     if st.button("Import Jobs"):
                         progress_bar = st.progress(0)
                         status_text = st.empty()
                         
-                        # Process each job
-                        for i, row in df.iterrows():
-                            progress = (i + 1) / len(df)
-                            progress_bar.progress(progress)
-                            status_text.text(f"Processing job {i+1} of {len(df)}: {row['Job Title']}")
-
-                            # Upload job
-                            result = upload_job_description(row['Job Title'], row['Job Description'])
-                            time.sleep(0.5)
+                        # Parse the CSV a chunk at a time, reading only the two needed columns
+                        uploaded_file.seek(0)
+                        chunks = pd.read_csv(uploaded_file, encoding='ISO-8859-1', usecols=["Job Title", "Job Description"], chunksize=CSV_CHUNK_SIZE)
+                        
+                        uploaded = total = 0
+                        chunk_start = 0
+                        for chunk in chunks:
+                            jobs = list(zip(chunk['Job Title'], chunk['Job Description']))
+                            chunk_end = uploaded_file.tell()
+                            
+                            # The row count is not known up front, so progress follows the share of the file read
+                            def show_progress(done, chunk_start=chunk_start, chunk_end=chunk_end, total=total, chunk_rows=len(jobs)):
+                                position = chunk_start + (chunk_end - chunk_start) * done / chunk_rows
+                                progress_bar.progress(min(position / uploaded_file.size, 1.0))
+                                status_text.text(f"Processed {total + done} jobs")
+                            
+                            # Upload the chunk's jobs concurrently
+                            uploaded += asyncio.run(import_jobs(jobs, show_progress))
+                            total += len(jobs)
+                            chunk_start = chunk_end
 
                         status_text.text("Import completed!")
+                        get_jobs.clear()
+                        get_match_counts.clear()
                         st.session_state.jobs = get_jobs()
-                        st.success(f"Successfully imported {len(df)} jobs.")
+                        st.success(f"Successfully imported {uploaded} of {total} jobs.")
                 else:
                     st.error("CSV file must contain 'Job Title' and 'Job Description' columns.")
             except Exception as e:
@@ -272,18 +450,25 @@ elif page == "Candidates":
         if not st.session_state.candidates:
             st.info("No candidates found. Add a new candidate to get started.")
         else:
-            for candidate in st.session_state.candidates:
-                with st.expander(f"{candidate['name']} "):
-                    st.write(f"**Candidate ID:** {candidate['id']}")
-                    
-                    # Actions
-                    col1, col2 = st.columns(2)
-                    # with col1:
-                    #     if st.button("View Details", key=f"view_{candidate['id']}"):
-                    #         st.info("Detail view not implemented yet")
-                    with col1:
-                        if st.button("Delete", key=f"delete_cand_{candidate['id']}"):
-                            st.error("Delete functionality not implemented yet")
+            # One table widget for all candidates instead of an expander and buttons per candidate
+            candidates_df = pd.DataFrame(st.session_state.candidates, columns=["name", "id"]).assign(action=None)
+            st.data_editor(
+                candidates_df,
+                column_config={
+                    "name": "Name",
+                    "id": "Candidate ID",
+                    # "View Details" is not implemented yet
+                    "action": st.column_config.SelectboxColumn("Action", options=["Delete"])
+                },
+                disabled=["name", "id"],
+                hide_index=True,
+                key="candidates_editor"
+            )
+            
+            # Actions chosen in the table
+            for row, changes in st.session_state.candidates_editor["edited_rows"].items():
+                if changes.get("action") == "Delete":
+                    st.error("Delete functionality not implemented yet")
     
     # Add candidate
     with cand_tab2:
@@ -297,15 +482,15 @@ elif page == "Candidates":
         if st.button("Submit Candidate"):
             if candidate_name and candidate_email and uploaded_cv:
                 with st.spinner("Processing CV..."):
-                    # Create a copy of the uploaded file
-                    cv_file = io.BytesIO(uploaded_cv.getvalue())
-                    cv_file.name = uploaded_cv.name
-                    
-                    result = upload_candidate_cv(cv_file, candidate_name, candidate_email)
+                    # Streamlit already holds the whole file in memory, and requests copies it into the multipart body
+                    result = upload_candidate_cv(uploaded_cv, candidate_name, candidate_email)
                     
                 if result:
                     st.success(f"Candidate '{candidate_name}' added successfully!")
-                    # Refresh candidates list
+                    # Refresh candidates list; earlier matches do not include the new candidate
+                    get_candidates.clear()
+                    fetch_matches.clear()
+                    get_match_counts.clear()
                     st.session_state.candidates = get_candidates()
                 else:
                     st.error("Failed to add candidate. Please check the API connection.")
@@ -322,6 +507,7 @@ elif page == "Matching":
         # Job selection
         st.subheader("Select Job")
         job_options = {job["title"]: job["id"] for job in st.session_state.jobs}
+        job_titles = list(job_options)
         
         if not job_options:
             st.warning("No jobs available. Please add jobs first.")
@@ -331,12 +517,12 @@ elif page == "Matching":
                 # Find the title for the current job ID
                 current_job_title = next((job["title"] for job in st.session_state.jobs 
                                         if job["id"] == st.session_state.current_job_id), 
-                                        list(job_options.keys())[0])
+                                        job_titles[0])
             else:
-                current_job_title = list(job_options.keys())[0]
+                current_job_title = job_titles[0]
                 
-            selected_job_title = st.selectbox("Job", options=list(job_options.keys()), 
-                                             index=list(job_options.keys()).index(current_job_title))
+            selected_job_title = st.selectbox("Job", options=job_titles, 
+                                             index=job_titles.index(current_job_title))
             selected_job_id = job_options[selected_job_title]
     
     with col2:
@@ -355,91 +541,44 @@ elif page == "Matching":
     if 'current_matches' in st.session_state and st.session_state.current_matches:
         st.subheader(f"Matches: {len(st.session_state.current_matches)} candidates")
         
-        # Create a dataframe for better display
-        match_data = []
-        for match in st.session_state.current_matches:
+        # Sort by match score once, for the table, the chart and the details
+        sorted_matches = sorted(st.session_state.current_matches, 
+                                key=lambda x: x.get("match_score", 0), 
+                                reverse=True)
+        
+        # Collect the table rows and the chart data in one pass
+        match_data, names, scores = [], [], []
+        for i, match in enumerate(sorted_matches):
             # Handle matching skills display
             matching_skills = match.get("matching_skills", [])
             skill_display = ", ".join(matching_skills[:3])
             if len(matching_skills) > 3:
                 skill_display += f" + {len(matching_skills) - 3} more"
-                
+            
+            name = match.get("name")
+            score = match.get("match_score", 0)
             match_data.append({
-                "Name": match.get("name", "Unknown"),
+                "Name": name if name is not None else "Unknown",
                 "Email": match.get("email", "N/A"),
-                "Match Score": f"{match.get('match_score', 0):.2f}",
+                "Match Score": f"{score:.2f}",
                 "Matching Skills": skill_display
             })
+            names.append(name if name is not None else f"Candidate {i}")
+            scores.append(score)
         
+        # Create a dataframe for better display
         df_matches = pd.DataFrame(match_data)
         st.dataframe(df_matches)
         
         # Visualize match scores
         st.subheader("Match Score Distribution")
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        # Sort by match score for better visualization
-        sorted_matches = sorted(st.session_state.current_matches, 
-                                key=lambda x: x.get("match_score", 0), 
-                                reverse=True)
-        
-        names = [m.get("name", f"Candidate {i}") for i, m in enumerate(sorted_matches)]
-        scores = [m.get("match_score", 0) for m in sorted_matches]
-        
-        bars = ax.bar(names, scores, color='#4CAF50')
-        
-        # Add value labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.annotate(f'{height:.2f}',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom')
-        
-        ax.set_xticklabels(names, rotation=45, ha='right')
-        ax.set_ylabel("Match Score")
-        ax.set_ylim(0, 1)
-        ax.set_title("Candidate Match Scores")
-        ax.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-        st.pyplot(fig)
+        # Drawn by the browser, so reruns only send the data
+        st.bar_chart(match_score_chart_data(names, scores), x="Candidate", y="Match Score", color="#4CAF50", sort=False)
         
         # Display detailed candidate information in expandable sections
         st.subheader("Candidate Details")
         for match in sorted_matches:
-            with st.expander(f"{match.get('name', 'Unknown')} - {match.get('match_score', 0):.2f} match"):
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.subheader("Matching Skills")
-                    if match.get("matching_skills"):
-                        for skill in match.get("matching_skills"):
-                            st.markdown(f"- {skill}")
-                    else:
-                        st.markdown("No specific skills extracted")
-                
-                with col2:
-                    # Additional candidate information could be displayed here
-                    st.subheader("Contact")
-                    st.markdown(f"**Email:** {match.get('email', 'N/A')}")
-                    
-                    # If there's a CV document link, add it here
-                    if "cv_document" in match:
-                        st.markdown(f"**CV Document:** [View]({match['cv_document']})")
-                
-                # Action buttons
-                col1, col2 = st.columns(2)
-                with col1:
-                    if st.button("View Full Resume", key=f"view_{match.get('candidate_id')}"):
-                        st.info("Resume view functionality to be implemented")
-                
-                with col2:
-                    if st.button("Schedule Interview", key=f"interview_{match.get('candidate_id')}"):
-                        st.session_state.interview_job_id = selected_job_id
-                        st.session_state.interview_candidate_id = match.get("candidate_id")
-                        st.session_state.page = "Interview Requests"
-                        st.rerun()
+            show_match_details(match, selected_job_id)
         
         # Select candidate for interview
         st.subheader("Schedule Interview")
@@ -495,11 +634,7 @@ elif page == "Interview Requests":
             )
         
         with col2:
-            date_options = []
-            for i in range(5):  # Next 5 business days
-                date = datetime.now() + pd.Timedelta(days=i+1)
-                if date.weekday() < 5:  # Monday to Friday
-                    date_options.append(date.strftime("%Y-%m-%d"))
+            date_options = next_business_days(date.today())
             
             proposed_dates = st.multiselect(
                 "Proposed Dates",
@@ -0,0 +1,79 @@
+# utils/llm_cache.py
+
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+def make_key(**request: Any) -> str:
+    """
+    Build a cache key from the fields that determine an LLM response
+
+    Args:
+        **request: JSON-serializable request fields (model, prompt or messages, options...)
+
+    Returns:
+        str: SHA-256 hex digest of the normalized request
+    """
+    normalized = json.dumps(request, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+class LLMCache:
+    """
+    In-memory LRU cache of LLM responses, evicting the least recently used entry when full.
+
+    Values are copied on the way in and out, so callers may modify the responses they get.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Maximum number of cached responses
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key returned by make_key
+
+        Returns:
+            A copy of the cached response, or None if missing
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        Store a response
+
+        Args:
+            key: Key returned by make_key
+            value: Response to cache
+        """
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        with self._lock:
+            self._entries.clear()
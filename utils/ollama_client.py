@@ -1,87 +1,315 @@
 # utils/ollama_client.py
 
+import asyncio
+import importlib.util
+import httpx
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import orjson
 import time
 import os
 import logging
-from typing import Dict, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from utils.llm_cache import LLMCache, make_key
+from utils.semantic_cache import SemanticCache
 
-# Configure logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+# Logging is configured by the application, not on import
 logger = logging.getLogger("ollama_client")
 
+# Requests sent at once by generate_batch / chat_batch; matches the server's OLLAMA_NUM_PARALLEL if set
+NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", 8))
+
+# Seconds to wait for a connection, and for a response to a generate/chat request
+CONNECT_TIMEOUT = 3.05
+REQUEST_TIMEOUT = (CONNECT_TIMEOUT, 30)
+
+# HTTP/2 needs the optional h2 package; httpx only negotiates it over TLS, so it applies when Ollama is behind an HTTPS proxy
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Request bodies are serialized with orjson, straight to bytes
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Installed models per Ollama URL (None if unreachable), reused by clients created within TAGS_TTL seconds
+TAGS_TTL = 30
+_tags_cache: Dict[str, Tuple[float, Optional[List[str]]]] = {}
+
+# Fallback responses, shared by the sync and async clients
+UNAVAILABLE_TEXT = "Sorry, the local LLM service is not available. Please check your Ollama installation."
+
+# Upper bound on generated tokens when the caller does not set max_tokens
+DEFAULT_MAX_TOKENS = 1000
+
+# Sampling options for the default temperature and max_tokens, shared by every request that uses them
+_DEFAULT_OPTIONS = {"temperature": 0.7, "num_predict": DEFAULT_MAX_TOKENS}
+
+def _build_request(model_name: str, system_prompt: Optional[str], max_tokens: int, temperature: float, **payload) -> Dict[str, Any]:
+    """Request body for /api/generate (payload: prompt) or /api/chat (payload: messages)"""
+    if temperature == _DEFAULT_OPTIONS["temperature"] and max_tokens == _DEFAULT_OPTIONS["num_predict"]:
+        options = _DEFAULT_OPTIONS
+    else:
+        options = {"temperature": temperature, "num_predict": max_tokens}
+    
+    request_data = {
+        "model": model_name,
+        **payload,
+        "stream": False,
+        "options": options
+    }
+    
+    if system_prompt:
+        request_data["system"] = system_prompt
+    
+    return request_data
+
+def _chat_messages(messages: list, system_prompt: Optional[str]) -> list:
+    """
+    Order chat messages so the static system instructions come first
+    
+    Ollama reuses the evaluated prompt of the previous request up to the first difference,
+    so static content at the start and varying content at the end keeps that shared prefix long.
+    /api/chat has no separate system field, so the system prompt becomes the first message.
+    """
+    system_messages = [message for message in messages if message.get("role") == "system"]
+    other_messages = [message for message in messages if message.get("role") != "system"]
+    if system_prompt:
+        system_messages.insert(0, {"role": "system", "content": system_prompt})
+    return system_messages + other_messages
+
+def _metadata(result: Dict[str, Any], model_name: str) -> Dict[str, Any]:
+    """Model name and timing fields of an Ollama response"""
+    return {
+        "model": model_name,
+        "total_duration": result.get("total_duration", 0),
+        "load_duration": result.get("load_duration", 0),
+        "prompt_eval_count": result.get("prompt_eval_count", 0),
+        "eval_count": result.get("eval_count", 0),
+        "eval_duration": result.get("eval_duration", 0)
+    }
+
+def _generate_result(result: Dict[str, Any], model_name: str) -> Dict[str, Any]:
+    """Return value of generate for a successful /api/generate response"""
+    return {"text": result.get("response", ""), **_metadata(result, model_name)}
+
+def _chat_result(result: Dict[str, Any], model_name: str) -> Dict[str, Any]:
+    """Return value of chat for a successful /api/chat response"""
+    return {"message": result.get("message", {"role": "assistant", "content": ""}), **_metadata(result, model_name)}
+
+def _generate_error(error: str, text: str) -> Dict[str, Any]:
+    """Return value of generate when no text was generated"""
+    return {"error": error, "text": text}
+
+def _chat_error(error: str, content: str) -> Dict[str, Any]:
+    """Return value of chat when no response was generated"""
+    return {"error": error, "message": {"role": "assistant", "content": content}}
+
 class OllamaClient:
     """Client for interacting with local Ollama instance for LLM inference"""
     
-    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:1b"):
+    def __init__(self, 
+                 base_url: str = "http://localhost:11434", 
+                 model: str = "llama3.2:1b",
+                 semantic_threshold: Optional[float] = None,
+                 semantic_max_entries: int = 2048,
+                 embedding_model: str = "nomic-embed-text:latest",
+                 warm_up: bool = False):
         """
         Initialize Ollama client
         
         Args:
             base_url: URL of the Ollama API
             model: Default model to use for inference
+            semantic_threshold: Cosine similarity at which generate reuses the response to an
+                earlier, similar prompt (None disables the semantic cache)
+            semantic_max_entries: Responses kept per semantic cache
+            embedding_model: Ollama model used to embed prompts for the semantic cache
+            warm_up: Load the default model into memory now, so the first request does not wait for it
         """
         self.base_url = base_url
         self.default_model = model
+        self.semantic_threshold = semantic_threshold
+        self.semantic_max_entries = semantic_max_entries
+        self.embedding_model = embedding_model
+        
+        # One session for all calls, so the connection to Ollama is kept alive and reused;
+        # failed connections and 502/503/504 responses are retried, but requests that timed out
+        # or broke after being sent are not, since Ollama may still be working on them
+        self._session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=2,
+                connect=2,
+                read=0,
+                backoff_factor=0.25,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset(["GET", "POST"]),
+                raise_on_status=False
+            )
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        
+        # Responses to deterministic (temperature 0) requests, reused for identical requests
+        self._cache = LLMCache()
+        self.stats = {"hits": 0, "misses": 0, "semantic_hits": 0}
+        
+        # generate_batch and chat_batch call in from several threads; guards stats and _response_tokens
+        self._stats_lock = threading.Lock()
+        
+        # Responses to paraphrased prompts, one cache per (model, system prompt, static prefix, max_tokens); created on first use
+        self._semantic_caches: Dict[tuple, SemanticCache] = {}
+        
+        # Moving average of the generated token count per (model, system prompt, static prefix),
+        # used to bound generate requests that do not set max_tokens
+        self._response_tokens: Dict[tuple, float] = {}
+        
         self.available = self._check_availability()
         
         # If Ollama is available, check if model is available
         if self.available:
             self._ensure_model_available()
+            if warm_up:
+                self._warm_up()
+    
+    def close(self) -> None:
+        """Close the pooled connections"""
+        self._session.close()
+    
+    def __enter__(self) -> "OllamaClient":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+    
+    def _cache_key(self, temperature: float, **request: Any) -> Optional[str]:
+        """Cache key of a request, or None if its response is not deterministic and must not be cached"""
+        if temperature != 0:
+            return None
+        return make_key(**request)
+    
+    def _cached(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached response for a key, counting the hit or miss"""
+        if key is None:
+            return None
+        result = self._cache.get(key)
+        self._count("hits" if result is not None else "misses")
+        return result
+    
+    def _count(self, name: str) -> None:
+        """Increment one of the stats counters"""
+        with self._stats_lock:
+            self.stats[name] += 1
+    
+    def _predict_max_tokens(self, length_id: Optional[tuple]) -> int:
+        """max_tokens for a request that did not set it: the usual response length plus a margin"""
+        typical = self._response_tokens.get(length_id) if length_id is not None else None
+        if typical is None:
+            return DEFAULT_MAX_TOKENS
+        return min(DEFAULT_MAX_TOKENS, int(typical * 1.3) + 32)
+    
+    def _record_response_tokens(self, length_id: Optional[tuple], eval_count: int) -> None:
+        """Update the moving average of generated tokens with one response"""
+        if length_id is None or not eval_count:
+            return
+        with self._stats_lock:
+            typical = self._response_tokens.get(length_id)
+            self._response_tokens[length_id] = eval_count if typical is None else 0.8 * typical + 0.2 * eval_count
+    
+    def _embed(self, text: str) -> Optional[Any]:
+        """Normalized embedding of a text, or None if it could not be computed"""
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/embed",
+                data=orjson.dumps({"model": self.embedding_model, "input": text}),
+                headers=JSON_HEADERS,
+                timeout=REQUEST_TIMEOUT
+            )
+            if response.status_code == 200:
+                return SemanticCache.normalize(orjson.loads(response.content)["embeddings"][0])
+            logger.warning(f"Embedding error: {response.status_code} - {response.text}")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError, KeyError, IndexError) as e:
+            logger.warning(f"Embedding error: {e}")
+        return None
     
     def _check_availability(self) -> bool:
-        """Check if Ollama service is available"""
+        """Check if Ollama service is available, keeping the list of installed models"""
+        cached = _tags_cache.get(self.base_url)
+        if cached is not None and time.monotonic() - cached[0] < TAGS_TTL:
+            self._model_names = cached[1]
+            return self._model_names is not None
+        
+        self._model_names = None
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            return response.status_code == 200
-        except requests.exceptions.RequestException as e:
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=(CONNECT_TIMEOUT, 5))
+            if response.status_code == 200:
+                models = orjson.loads(response.content).get("models", [])
+                self._model_names = [model.get("name") for model in models]
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.warning(f"Ollama service not available: {e}")
-            return False
+        
+        _tags_cache[self.base_url] = (time.monotonic(), self._model_names)
+        return self._model_names is not None
     
     def _ensure_model_available(self) -> None:
         """Check if the model is available and pull it if not"""
-        try:
-            response = requests.get(f"{self.base_url}/api/tags")
-            models = response.json().get("models", [])
+        if self.default_model not in self._model_names:
+            logger.info(f"Model {self.default_model} not found. Pulling from Ollama...")
+            self._pull_model()
             
-            model_names = [model.get("name") for model in models]
-            if self.default_model not in model_names:
-                logger.info(f"Model {self.default_model} not found. Pulling from Ollama...")
-                self._pull_model()
+            # The cached model list no longer matches the server
+            _tags_cache.pop(self.base_url, None)
+    
+    def _warm_up(self) -> None:
+        """Load the default model; a generate request without a prompt only loads it"""
+        try:
+            response = self._session.post(
+                f"{self.base_url}/api/generate",
+                data=orjson.dumps({"model": self.default_model}),
+                headers=JSON_HEADERS,
+                timeout=(CONNECT_TIMEOUT, None)
+            )
+            if response.status_code != 200:
+                logger.warning(f"Could not load model {self.default_model}: {response.status_code} - {response.text}")
         except requests.exceptions.RequestException as e:
-            logger.error(f"Error checking model availability: {e}")
+            logger.warning(f"Could not load model {self.default_model}: {e}")
     
     def _pull_model(self) -> None:
         """Pull the model from Ollama"""
         try:
-            # This is a long-running operation, so we'll just start it
-            response = requests.post(
+            # This is a long-running operation, so we'll just start it;
+            # only connecting is timed out, the pull itself may take as long as it needs
+            with self._session.post(
                 f"{self.base_url}/api/pull",
                 json={"name": self.default_model},
-                stream=True
-            )
-            
-            logger.info(f"Started pulling model {self.default_model}")
-            
-            # Log progress
-            for line in response.iter_lines():
-                if line:
-                    progress_data = json.loads(line)
-                    if "completed" in progress_data and progress_data["completed"]:
+                stream=True,
+                timeout=(CONNECT_TIMEOUT, None)
+            ) as response:
+                logger.info(f"Started pulling model {self.default_model}")
+                
+                # Log progress; lines are scanned as bytes and only parsed if they carry a field we use
+                for line in response.iter_lines(chunk_size=65536):
+                    if b'"completed"' not in line and b'"status"' not in line:
+                        continue
+                    progress_data = orjson.loads(line)
+                    if progress_data.get("completed"):
                         logger.info(f"Model {self.default_model} pulled successfully")
                         break
                     elif "status" in progress_data:
                         logger.info(f"Pull status: {progress_data['status']}")
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Error pulling model: {e}")
     
     def generate(self, 
                 prompt: str, 
                 model: Optional[str] = None, 
                 system_prompt: Optional[str] = None,
-                max_tokens: int = 1000,
-                temperature: float = 0.7) -> Dict[str, Any]:
+                max_tokens: Optional[int] = None,
+                temperature: float = 0.7,
+                static_prefix: Optional[str] = None) -> Dict[str, Any]:
         """
         Generate text using Ollama
         
@@ -89,64 +317,145 @@ class OllamaClient:
             prompt: The prompt to generate from
             model: Model to use (defaults to self.default_model)
             system_prompt: Optional system prompt
-            max_tokens: Maximum number of tokens to generate
+            max_tokens: Maximum number of tokens to generate; if None, derived from the length of earlier
+                responses with the same system prompt and static prefix (at most DEFAULT_MAX_TOKENS), and
+                retried once with DEFAULT_MAX_TOKENS if the response is cut off at that limit
             temperature: Sampling temperature
+            static_prefix: Instructions shared by many prompts, always placed at the top of the prompt
+                so Ollama can reuse their evaluation from the previous request
             
         Returns:
             Dict containing generated text and metadata
         """
         if not self.available:
             logger.warning("Ollama not available. Returning fallback response.")
-            return {
-                "error": "Ollama not available",
-                "text": "Sorry, the local LLM service is not available. Please check your Ollama installation."
-            }
+            return _generate_error("Ollama not available", UNAVAILABLE_TEXT)
         
         model_name = model or self.default_model
         
-        request_data = {
-            "model": model_name,
-            "prompt": prompt,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens
-            }
-        }
+        # Identical deterministic requests skip Ollama entirely
+        key = self._cache_key(temperature, m=model_name, f=static_prefix, p=prompt, s=system_prompt, t=temperature, n=max_tokens)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         
-        if system_prompt:
-            request_data["system"] = system_prompt
+        # Paraphrases of an earlier prompt reuse its response; only the varying part is compared
+        semantic_cache, vector = None, None
+        if self.semantic_threshold is not None:
+            cache_id = (model_name, system_prompt, static_prefix, max_tokens)
+            semantic_cache = self._semantic_caches.get(cache_id)
+            if semantic_cache is None:
+                semantic_cache = self._semantic_caches[cache_id] = SemanticCache(
+                    threshold=self.semantic_threshold, max_entries=self.semantic_max_entries
+                )
+            vector = self._embed(prompt)
+            match = semantic_cache.lookup(vector) if vector is not None else None
+            if match is not None:
+                result, similarity = match
+                self._count("semantic_hits")
+                return {**result, "cached": True, "similarity": similarity}
+        
+        # Prompts sharing instructions tend to get answers of similar length, so unless the caller
+        # set a limit, stop generation a margin past the usual length instead of at DEFAULT_MAX_TOKENS
+        length_id = (model_name, system_prompt, static_prefix) if system_prompt or static_prefix else None
+        num_predict = max_tokens if max_tokens is not None else self._predict_max_tokens(length_id)
+        
+        if static_prefix:
+            prompt = f"{static_prefix}\n\n{prompt}"
+        request_data = _build_request(model_name, system_prompt, num_predict, temperature, prompt=prompt)
         
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=request_data,
-                timeout=30
-            )
+            response = self._post_generate(request_data)
+            raw = orjson.loads(response.content) if response.status_code == 200 else None
             
-            if response.status_code == 200:
-                result = response.json()
-                return {
-                    "text": result.get("response", ""),
-                    "model": model_name,
-                    "total_duration": result.get("total_duration", 0),
-                    "load_duration": result.get("load_duration", 0),
-                    "prompt_eval_count": result.get("prompt_eval_count", 0),
-                    "eval_count": result.get("eval_count", 0),
-                    "eval_duration": result.get("eval_duration", 0)
-                }
+            # Hitting a predicted limit may only mean this answer is longer than usual, so retry once with the full budget
+            if raw is not None and raw.get("done_reason") == "length" and max_tokens is None and num_predict < DEFAULT_MAX_TOKENS:
+                response = self._post_generate(_build_request(model_name, system_prompt, DEFAULT_MAX_TOKENS, temperature, prompt=prompt))
+                raw = orjson.loads(response.content) if response.status_code == 200 else None
+            
+            if raw is not None:
+                result = _generate_result(raw, model_name)
+                self._record_response_tokens(length_id, result["eval_count"])
+                
+                # Text cut off by the token limit is incomplete, so it is not cached
+                if raw.get("done_reason") != "length":
+                    if key is not None:
+                        self._cache.set(key, result)
+                    if vector is not None:
+                        semantic_cache.add(vector, result)
+                return result
             else:
                 logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                return {
-                    "error": f"API error: {response.status_code}",
-                    "text": "An error occurred while generating text."
-                }
-        except requests.exceptions.RequestException as e:
+                return _generate_error(f"API error: {response.status_code}", "An error occurred while generating text.")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
+            logger.error(f"Request error: {e}")
+            return _generate_error(f"Request error: {str(e)}", "An error occurred while connecting to Ollama.")
+    
+    def _post_generate(self, request_data: Dict[str, Any]) -> requests.Response:
+        """Send a request to /api/generate"""
+        return self._session.post(
+            f"{self.base_url}/api/generate",
+            data=orjson.dumps(request_data),
+            headers=JSON_HEADERS,
+            timeout=REQUEST_TIMEOUT
+        )
+    
+    def generate_stream(self, 
+                        prompt: str, 
+                        model: Optional[str] = None, 
+                        system_prompt: Optional[str] = None,
+                        max_tokens: int = 1000,
+                        temperature: float = 0.7) -> Iterator[str]:
+        """
+        Generate text using Ollama, yielding it piece by piece as it is generated
+        
+        Args:
+            prompt: The prompt to generate from
+            model: Model to use (defaults to self.default_model)
+            system_prompt: Optional system prompt
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature
+            
+        Yields:
+            Generated text fragments; the fallback text of generate if nothing could be generated
+        """
+        if not self.available:
+            logger.warning("Ollama not available. Returning fallback response.")
+            yield UNAVAILABLE_TEXT
+            return
+        
+        model_name = model or self.default_model
+        request_data = {**_build_request(model_name, system_prompt, max_tokens, temperature, prompt=prompt), "stream": True}
+        
+        try:
+            # Only connecting is timed out; tokens may be slow to arrive while the model loads
+            with self._session.post(
+                f"{self.base_url}/api/generate",
+                data=orjson.dumps(request_data),
+                headers=JSON_HEADERS,
+                stream=True,
+                timeout=(CONNECT_TIMEOUT, None)
+            ) as response:
+                if response.status_code != 200:
+                    logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                    yield "An error occurred while generating text."
+                    return
+                
+                # One JSON object per line, each carrying the next fragment
+                for line in response.iter_lines(chunk_size=4096):
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    if "error" in chunk:
+                        logger.error(f"Ollama API error: {chunk['error']}")
+                        break
+                    if chunk.get("response"):
+                        yield chunk["response"]
+                    if chunk.get("done"):
+                        break
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Request error: {e}")
-            return {
-                "error": f"Request error: {str(e)}",
-                "text": "An error occurred while connecting to Ollama."
-            }
+            yield "An error occurred while connecting to Ollama."
     
     def chat(self, 
              messages: list, 
@@ -169,68 +478,178 @@ class OllamaClient:
         """
         if not self.available:
             logger.warning("Ollama not available. Returning fallback response.")
-            return {
-                "error": "Ollama not available",
-                "message": {
-                    "role": "assistant",
-                    "content": "Sorry, the local LLM service is not available. Please check your Ollama installation."
-                }
-            }
+            return _chat_error("Ollama not available", UNAVAILABLE_TEXT)
         
         model_name = model or self.default_model
         
-        request_data = {
-            "model": model_name,
-            "messages": messages,
-            "stream": False,
-            "options": {
-                "temperature": temperature,
-                "num_predict": max_tokens
-            }
-        }
+        # Identical deterministic conversations skip Ollama entirely
+        key = self._cache_key(temperature, m=model_name, c=messages, s=system_prompt, t=temperature, n=max_tokens)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
         
-        if system_prompt:
-            request_data["system"] = system_prompt
+        request_data = _build_request(model_name, None, max_tokens, temperature, messages=_chat_messages(messages, system_prompt))
         
         try:
-            response = requests.post(
+            response = self._session.post(
                 f"{self.base_url}/api/chat",
-                json=request_data,
-                timeout=30
+                data=orjson.dumps(request_data),
+                headers=JSON_HEADERS,
+                timeout=REQUEST_TIMEOUT
             )
             
             if response.status_code == 200:
-                result = response.json()
-                return {
-                    "message": result.get("message", {"role": "assistant", "content": ""}),
-                    "model": model_name,
-                    "total_duration": result.get("total_duration", 0),
-                    "load_duration": result.get("load_duration", 0),
-                    "prompt_eval_count": result.get("prompt_eval_count", 0),
-                    "eval_count": result.get("eval_count", 0),
-                    "eval_duration": result.get("eval_duration", 0)
-                }
+                result = _chat_result(orjson.loads(response.content), model_name)
+                if key is not None:
+                    self._cache.set(key, result)
+                return result
             else:
                 logger.error(f"Ollama API error: {response.status_code} - {response.text}")
-                return {
-                    "error": f"API error: {response.status_code}",
-                    "message": {
-                        "role": "assistant", 
-                        "content": "An error occurred while generating a response."
-                    }
-                }
-        except requests.exceptions.RequestException as e:
+                return _chat_error(f"API error: {response.status_code}", "An error occurred while generating a response.")
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             logger.error(f"Request error: {e}")
-            return {
-                "error": f"Request error: {str(e)}",
-                "message": {
-                    "role": "assistant",
-                    "content": "An error occurred while connecting to Ollama."
-                }
-            }
+            return _chat_error(f"Request error: {str(e)}", "An error occurred while connecting to Ollama.")
+    
+    def generate_batch(self, prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Generate text for several prompts, keeping NUM_PARALLEL requests in flight
+        
+        Args:
+            prompts: Prompts to generate from
+            **kwargs: Arguments passed to generate for every prompt
+            
+        Returns:
+            One generate result per prompt, in order
+        """
+        with ThreadPoolExecutor(max_workers=NUM_PARALLEL) as executor:
+            return list(executor.map(lambda prompt: self.generate(prompt, **kwargs), prompts))
+    
+    def chat_batch(self, conversations: List[list], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Chat completion for several conversations, keeping NUM_PARALLEL requests in flight
+        
+        Args:
+            conversations: One message list per conversation
+            **kwargs: Arguments passed to chat for every conversation
+            
+        Returns:
+            One chat result per conversation, in order
+        """
+        with ThreadPoolExecutor(max_workers=NUM_PARALLEL) as executor:
+            return list(executor.map(lambda messages: self.chat(messages, **kwargs), conversations))
+
+class AsyncOllamaClient:
+    """
+    Async client for Ollama, for running many generations concurrently
+    
+    Concurrent requests only run in parallel if the Ollama server allows it: set OLLAMA_NUM_PARALLEL
+    on the server to the number of requests each model may process at once, and OLLAMA_MAX_LOADED_MODELS
+    to the number of models that may stay loaded when requests use different models.
+    
+    Unlike OllamaClient, availability is not checked up front: requests to an unreachable
+    server return the same error responses as a failed request.
+    
+    If h2 is installed and base_url is HTTPS, concurrent requests are multiplexed over HTTP/2.
+    """
+    
+    def __init__(self, base_url: str = "http://localhost:11434", model: str = "llama3.2:1b", max_connections: int = 32):
+        """
+        Initialize async Ollama client
+        
+        Args:
+            base_url: URL of the Ollama API
+            model: Default model to use for inference
+            max_connections: Maximum number of requests in flight at once
+        """
+        self.base_url = base_url
+        self.default_model = model
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(REQUEST_TIMEOUT[1], connect=CONNECT_TIMEOUT),
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+    
+    async def aclose(self) -> None:
+        """Close the pooled connections"""
+        await self._client.aclose()
+    
+    async def __aenter__(self) -> "AsyncOllamaClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    async def agenerate(self, 
+                        prompt: str, 
+                        model: Optional[str] = None, 
+                        system_prompt: Optional[str] = None,
+                        max_tokens: int = 1000,
+                        temperature: float = 0.7) -> Dict[str, Any]:
+        """Generate text using Ollama; same arguments and return value as OllamaClient.generate"""
+        model_name = model or self.default_model
+        request_data = _build_request(model_name, system_prompt, max_tokens, temperature, prompt=prompt)
+        
+        try:
+            response = await self._client.post("/api/generate", content=orjson.dumps(request_data), headers=JSON_HEADERS)
+            
+            if response.status_code == 200:
+                return _generate_result(orjson.loads(response.content), model_name)
+            else:
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return _generate_error(f"API error: {response.status_code}", "An error occurred while generating text.")
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error(f"Request error: {e}")
+            return _generate_error(f"Request error: {str(e)}", "An error occurred while connecting to Ollama.")
+    
+    async def achat(self, 
+                    messages: list, 
+                    model: Optional[str] = None,
+                    system_prompt: Optional[str] = None,
+                    max_tokens: int = 1000,
+                    temperature: float = 0.7) -> Dict[str, Any]:
+        """Chat completion using Ollama; same arguments and return value as OllamaClient.chat"""
+        model_name = model or self.default_model
+        request_data = _build_request(model_name, None, max_tokens, temperature, messages=_chat_messages(messages, system_prompt))
+        
+        try:
+            response = await self._client.post("/api/chat", content=orjson.dumps(request_data), headers=JSON_HEADERS)
+            
+            if response.status_code == 200:
+                return _chat_result(orjson.loads(response.content), model_name)
+            else:
+                logger.error(f"Ollama API error: {response.status_code} - {response.text}")
+                return _chat_error(f"API error: {response.status_code}", "An error occurred while generating a response.")
+        except (httpx.HTTPError, orjson.JSONDecodeError) as e:
+            logger.error(f"Request error: {e}")
+            return _chat_error(f"Request error: {str(e)}", "An error occurred while connecting to Ollama.")
+    
+    async def generate_batch(self, prompts: List[str], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Generate text for several prompts concurrently
+        
+        Args:
+            prompts: Prompts to generate from
+            **kwargs: Arguments passed to agenerate for every prompt
+            
+        Returns:
+            One agenerate result per prompt, in order
+        """
+        return await asyncio.gather(*(self.agenerate(prompt, **kwargs) for prompt in prompts))
+
+# Singleton instance for reuse, created on first use so importing this module makes no HTTP calls
+_ollama: Optional[OllamaClient] = None
+_ollama_lock = threading.Lock()
 
-# Singleton instance for reuse
-ollama = OllamaClient()
+def get_ollama() -> OllamaClient:
+    """Return the shared OllamaClient, creating it on first call"""
+    global _ollama
+    if _ollama is None:
+        with _ollama_lock:
+            if _ollama is None:
+                # Created right before its first request, so load the model now
+                _ollama = OllamaClient(warm_up=True)
+    return _ollama
 
 # Example usage
 def get_llm_response(prompt, system_prompt=None, fallback_text=""):
@@ -245,7 +664,7 @@ def get_llm_response(prompt, system_prompt=None, fallback_text=""):
     Returns:
         String response from the LLM or fallback text
     """
-    response = ollama.generate(prompt, system_prompt=system_prompt)
+    response = get_ollama().generate(prompt, system_prompt=system_prompt)
     
     if "error" in response:
         logger.warning(f"Using fallback for prompt: {prompt[:50]}...")
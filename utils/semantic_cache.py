@@ -0,0 +1,134 @@
+# utils/semantic_cache.py
+
+import copy
+import threading
+from typing import Any, List, Optional, Tuple
+import faiss
+import numpy as np
+
+# Caches holding at least this many entries find the closest prompt with an HNSW graph instead of scanning them all
+HNSW_MIN_ENTRIES = 10000
+
+# Neighbours taken from the index per lookup; some may be entries that were evicted since
+HNSW_CANDIDATES = 8
+
+# Graph search breadth; higher finds the true closest entry more often at some cost in lookup time
+HNSW_EF_SEARCH = 64
+
+class SemanticCache:
+    """
+    Reuse LLM responses for prompts that are paraphrases of earlier ones.
+
+    Prompt embeddings are L2-normalized and stored with 8 bits per dimension, a quarter of their
+    float32 size, in a FAISS scalar-quantizer index that computes inner products (cosine similarity)
+    directly on the codes. Every component of a normalized vector lies in [-1, 1], so the quantizer
+    is fitted to that range up front instead of being trained on data. Queries stay float32,
+    so only the stored side is quantized.
+    Small caches scan every entry; large ones search an HNSW graph over the same codes, making a lookup O(log N).
+
+    Entries are kept in a fixed-size ring buffer, evicting the oldest first. The index cannot overwrite
+    entries, so it keeps the vectors of evicted ones; they are skipped on lookup, and the index is
+    rebuilt from the live entries' codes once half of it is stale.
+    """
+
+    def __init__(self, threshold: float = 0.92, max_entries: int = 2048):
+        """
+        Initialize the cache
+
+        Args:
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached responses
+        """
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self._values: List[Any] = [None] * max_entries
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+
+        # Index holding the vectors; index label -> ring slot, and ring slot -> its current index label
+        self._use_hnsw = max_entries >= HNSW_MIN_ENTRIES
+        self._index: Optional[faiss.Index] = None
+        self._slots: List[int] = []
+        self._labels = np.full(max_entries, -1, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def lookup(self, vector: np.ndarray) -> Optional[Tuple[Any, float]]:
+        """
+        Find the cached response closest to a prompt embedding
+
+        Args:
+            vector: Normalized embedding from normalize()
+
+        Returns:
+            A copy of the cached response and its similarity if it reaches the threshold, else None
+        """
+        query = np.ascontiguousarray(vector, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            if self._size == 0:
+                return None
+            similarities, labels = self._index.search(query, HNSW_CANDIDATES)
+            for similarity, label in zip(similarities[0].tolist(), labels[0].tolist()):
+                if label == -1 or similarity < self.threshold:
+                    return None
+                slot = self._slots[label]
+                if self._labels[slot] == label:
+                    # Quantization error can push the similarity of a near-identical prompt slightly above 1
+                    return copy.deepcopy(self._values[slot]), min(similarity, 1.0)
+            return None
+
+    def _new_index(self, dim: int) -> faiss.Index:
+        """Empty 8-bit index for normalized vectors, flat or HNSW depending on the cache size"""
+        quantizer_type = faiss.ScalarQuantizer.QT_8bit
+        if self._use_hnsw:
+            index = faiss.IndexHNSWSQ(dim, quantizer_type, 32, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = HNSW_EF_SEARCH
+        else:
+            index = faiss.IndexScalarQuantizer(dim, quantizer_type, faiss.METRIC_INNER_PRODUCT)
+        
+        # Training on the two corners of the unit range sets every dimension's range to [-1, 1]
+        index.train(np.stack([np.full(dim, -1.0, dtype=np.float32), np.full(dim, 1.0, dtype=np.float32)]))
+        return index
+
+    def _rebuild_index(self) -> None:
+        """Move the live entries to a new index"""
+        # Decoded vectors are exactly representable, so re-encoding them loses no further precision
+        vectors = self._index.reconstruct_batch(self._labels[:self._size])
+        self._index = self._new_index(self._index.d)
+        self._index.add(vectors)
+        self._slots = list(range(self._size))
+        self._labels[:self._size] = np.arange(self._size)
+
+    def add(self, vector: np.ndarray, value: Any) -> None:
+        """Store a response under its prompt embedding"""
+        row = np.ascontiguousarray(vector, dtype=np.float32).reshape(1, -1)
+        with self._lock:
+            if self._index is None:
+                self._index = self._new_index(row.shape[1])
+                self._slots = []
+            elif self._index.ntotal >= 2 * self.max_entries:
+                self._rebuild_index()
+
+            slot = self._next
+            self._values[slot] = copy.deepcopy(value)
+            self._labels[slot] = self._index.ntotal
+            self._slots.append(slot)
+            self._index.add(row)
+            self._next = (slot + 1) % self.max_entries
+            self._size = min(self._size + 1, self.max_entries)
+
+    def clear(self) -> None:
+        """Drop all cached responses"""
+        with self._lock:
+            self._values = [None] * self.max_entries
+            self._size = 0
+            self._next = 0
+            self._index = None
+
+    @staticmethod
+    def normalize(embedding: Any) -> np.ndarray:
+        """Convert an embedding into a normalized float32 vector"""
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)